@@ -13,8 +13,13 @@ class BaseCog(commands.Cog):
         self.bot = bot
         self.logger = logging.getLogger(f"KurdDX.ext.{self.__class__.__name__}")
 
+        self.bot.error_handlers.register_object(self)
+
         self.bot.loop.create_task(self._init_wrapper())
 
+    async def cog_unload(self):
+        self.bot.error_handlers.unregister_object(self)
+
     async def _init_wrapper(self):
         if asyncio.iscoroutinefunction(self.on_init):
             await self.on_init()
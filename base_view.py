@@ -5,10 +5,14 @@ from typing import Any
 import discord
 
 from utils import local_file
+from utils.embed_template import EmbedTemplate
 from utils.exceptions import *
 from kurd_dx import KurdDX
 
 
+VALUE_ERROR = EmbedTemplate("Value Error", thumbnail="res/images/error.png")
+
+
 class BaseView(discord.ui.View):
     def __init__(
         self,
@@ -65,11 +69,10 @@ class BaseView(discord.ui.View):
             await super().on_error(interaction, error, item)
     
     async def on_value_error(self, interaction: discord.Interaction, error: Exception):
-        embed = discord.Embed(
-            title="Value Error",
-            description=str(error),
-            color=discord.Color.teal()
-        )
-        url, file = local_file.attach("res/images/error.png")
-        embed.set_thumbnail(url=url)
-        await interaction.response.send_message(embed=embed, file=file)
+        embed, file = VALUE_ERROR.render(str(error))
+        if file is None:
+            await interaction.response.send_message(embed=embed)
+        else:
+            await interaction.response.send_message(embed=embed, file=file)
+            if local_file.assets.reuse_urls:
+                local_file.assets.record_upload(await interaction.original_response())
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import shlex
+from multiprocessing.connection import Connection
+from typing import Any, Callable
+
+import discord
+
+from console.register_commands import get_console
+from console.capture import capture_output
+from console import command as console_command
+
+
+logger = logging.getLogger("KurdDX.cluster")
+
+# Builds a worker's bot from (shard_ids, shard_count). Must be picklable (module-level).
+BotFactory = Callable[[list[int], int], Any]
+
+
+def shard_ranges(shard_count: int, workers: int) -> list[list[int]]:
+    """
+    Splits shards 0 to `shard_count - 1` into `workers` contiguous ranges of nearly equal size.
+    """
+    workers = max(1, min(workers, shard_count))
+    size, extra = divmod(shard_count, workers)
+    ranges = []
+    start = 0
+    for i in range(workers):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append(list(range(start, stop)))
+        start = stop
+    return ranges
+
+
+class Worker:
+    def __init__(self, index: int, shard_ids: list[int], process: multiprocessing.Process, conn: Connection):
+        self.index = index
+        self.shard_ids = shard_ids
+        self.process = process
+        self.conn = conn
+
+    @property
+    def label(self) -> str:
+        return f"worker {self.index} (shards {self.shard_ids[0]}-{self.shard_ids[-1]})"
+
+
+class Result:
+    """
+    A worker's answer to a console command.
+
+    `code` is the command's return code, or None if it failed or the worker did
+    not answer. `data` is the structured result of commands that support
+    merging (see `MERGERS`).
+    """
+
+    def __init__(self, worker: Worker, code: int | None, output: str, data: Any = None):
+        self.worker = worker
+        self.code = code
+        self.output = output
+        self.data = data
+
+
+class Supervisor:
+    """
+    Runs the bot as several processes, each owning a range of shards.
+
+    The supervisor keeps a pipe to every worker. Console commands read from
+    stdin are sent to all workers, each worker runs them against its own bot,
+    and the results are merged for commands listed in `MERGERS` (e.g. totals
+    across the cluster for `servers`) or printed per worker otherwise.
+
+    Parameters
+    ----------
+    token : str
+        The bot token, passed to every worker.
+    shard_count : int
+        The total number of shards across all workers.
+    workers : int
+        The number of worker processes.
+    factory : BotFactory
+        Creates each worker's bot. Tests can pass a factory returning a bot
+        whose `start` does not connect to the gateway.
+    timeout : float
+        How long to wait for each worker's command output, in seconds.
+    """
+
+    def __init__(self, token: str, shard_count: int, workers: int, factory: BotFactory, timeout: float = 60):
+        self.token = token
+        self.shard_count = shard_count
+        self.factory = factory
+        self.timeout = timeout
+        self.workers: list[Worker] = []
+        self._ranges = shard_ranges(shard_count, workers)
+        self._sequence = itertools.count()
+
+    def start(self):
+        for index, shard_ids in enumerate(self._ranges):
+            conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=run_worker,
+                args=(child_conn, index, shard_ids, self.shard_count, self.token, self.factory),
+                name=f"KurdDX.worker-{index}",
+            )
+            process.start()
+            child_conn.close()
+            worker = Worker(index, shard_ids, process, conn)
+            self.workers.append(worker)
+            logger.info("Started %s (pid %d)", worker.label, process.pid)
+
+    def execute(self, command: str) -> list[Result]:
+        """
+        Runs a console command on every worker.
+
+        Returns
+        -------
+        list[Result]
+            Each worker's result, in worker order.
+        """
+        sequence = next(self._sequence)
+        sent = []
+        for worker in self.workers:
+            try:
+                worker.conn.send((sequence, command))
+            except (BrokenPipeError, OSError):
+                continue
+            sent.append(worker)
+
+        results = []
+        for worker in self.workers:
+            if worker not in sent:
+                results.append(Result(worker, None, "Worker is not running"))
+            else:
+                results.append(self._receive(worker, sequence))
+        return results
+
+    @staticmethod
+    def merge(command: str, results: list[Result]) -> list[str] | None:
+        """
+        Combines the workers' results into one output, for commands that have a
+        merger and returned a result on every worker. Returns None otherwise.
+        """
+        try:
+            cs_command, _ = get_console().resolve(shlex.split(command))
+        except ValueError:
+            return None
+
+        merger = MERGERS.get(cs_command.name) if cs_command is not None else None
+        if merger is None or any(result.data is None for result in results):
+            return None
+        return merger([result.data for result in results])
+
+    def _receive(self, worker: Worker, sequence: int) -> Result:
+        try:
+            while worker.conn.poll(self.timeout):
+                reply_sequence, code, output, data = worker.conn.recv()
+                # Skip late replies to commands that already timed out
+                if reply_sequence == sequence:
+                    return Result(worker, code, output, data)
+        except (EOFError, OSError):
+            return Result(worker, None, "Worker is not running")
+        return Result(worker, None, "Timed out")
+
+    def stop(self, timeout: float = 30):
+        for worker in self.workers:
+            try:
+                worker.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+
+        for worker in self.workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                logger.warning("%s did not stop in time; terminating", worker.label)
+                worker.process.terminate()
+                worker.process.join()
+            worker.conn.close()
+
+    def run(self):
+        self.start()
+        try:
+            while any(worker.process.is_alive() for worker in self.workers):
+                try:
+                    command = input()
+                except EOFError:
+                    break
+
+                if not command.strip():
+                    continue
+                if command.strip() == "stop":
+                    break
+
+                results = self.execute(command)
+                merged = self.merge(command, results)
+                if merged is not None:
+                    logger.info("[%d workers]\n%s", len(results), "\n".join(merged))
+                    continue
+
+                for result in results:
+                    code = result.code
+                    logger.info("[%s]%s\n%s", result.worker.label, "" if code in (0, None) else f" exited with {code}", result.output or "No output")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            logger.info("Stopping workers...")
+            self.stop()
+
+
+def run_worker(conn: Connection, index: int, shard_ids: list[int], shard_count: int, token: str, factory: BotFactory):
+    discord.utils.setup_logging(root=True)
+
+    bot = factory(shard_ids, shard_count)
+    try:
+        asyncio.run(_serve(conn, bot, token))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        conn.close()
+
+
+async def _serve(conn: Connection, bot: Any, token: str):
+    runner = asyncio.create_task(bot.start(token))
+    try:
+        while not runner.done():
+            receive = asyncio.create_task(_receive(conn))
+            await asyncio.wait({runner, receive}, return_when=asyncio.FIRST_COMPLETED)
+            if not receive.done():
+                receive.cancel()
+                break
+
+            message = receive.result()
+            if message is None:
+                break
+
+            sequence, command = message
+            code, output, data = await _execute(bot, command)
+            conn.send((sequence, code, output, data))
+    finally:
+        if not bot.is_closed():
+            await bot.close()
+        try:
+            await runner
+        except Exception as e:
+            logger.error("Bot stopped with an error: %s", e)
+
+
+async def _receive(conn: Connection) -> Any:
+    loop = asyncio.get_running_loop()
+    # Poll with a timeout so a cancelled receive does not keep an executor thread blocked
+    while not await loop.run_in_executor(None, conn.poll, 0.5):
+        pass
+    try:
+        return conn.recv()
+    except EOFError:
+        return None
+
+
+async def _execute(bot: Any, command: str) -> tuple[int | None, str, Any]:
+    code = None
+    with capture_output() as capture:
+        try:
+            code = await get_console().execute_command(bot, command)
+        except Exception as e:
+            logging.getLogger("discord.dev_command").error(f"Command execution failed: {e}")
+    return code, capture.getvalue(), capture.data
+
+
+def _merge_servers(summaries: list[dict]) -> list[str]:
+    total = {key: sum(s[key] for s in summaries) for key in ("guilds", "members", "humans", "bots", "channels", "roles")}
+    total["shards"] = sorted(shard for s in summaries for shard in s["shards"])
+    return console_command.format_servers(total)
+
+
+def _merge_server_list(row_lists: list[list[dict]]) -> list[str]:
+    rows = [row for rows in row_lists for row in rows]
+    if not rows:
+        return ["Bot is not in any servers."]
+    rows.sort(key=lambda row: row["shard"][0] if row["shard"] is not None else -1)
+    return console_command.format_server_list(rows)
+
+
+# Console commands whose per-worker results are combined into one output
+MERGERS: dict[str, Callable[[list[Any]], list[str]]] = {
+    "servers": _merge_servers,
+    "server list": _merge_server_list,
+}
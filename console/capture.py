@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import io
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+import discord
+
+
+class Capture:
+    def __init__(self, formatter: logging.Formatter | None = None, as_file: bool = False):
+        self.stream = io.StringIO()
+        self.formatter = formatter or logging.Formatter()
+        self.as_file = as_file
+        self.attachments: list[discord.File] = []
+        # Structured result set by commands whose output can be merged across cluster workers
+        self.data: Any = None
+
+    def getvalue(self) -> str:
+        return self.stream.getvalue()
+
+
+_current: ContextVar[Capture | None] = ContextVar("console_capture", default=None)
+
+
+class CaptureHandler(logging.Handler):
+    """
+    Writes records to the capture active in the current context, if any.
+
+    One instance stays attached for the lifetime of the process, so the cost
+    per log line does not grow with the number of captures taken.
+    """
+    # Must run in the thread that logs, where the caller's context is visible
+    synchronous = True
+
+    def emit(self, record: logging.LogRecord):
+        capture = _current.get()
+        if capture is None:
+            return
+        try:
+            capture.stream.write(capture.formatter.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+
+def current() -> Capture | None:
+    return _current.get()
+
+
+@contextmanager
+def capture_output(formatter: logging.Formatter | None = None, as_file: bool = False) -> Iterator[Capture]:
+    """
+    Collects console output logged by the current task (and tasks it creates) inside the block.
+
+    Concurrent captures in other tasks do not see each other's output. With
+    `as_file`, commands may add files to `attachments` instead of logging
+    large output line by line.
+    """
+    capture = Capture(formatter, as_file)
+    token = _current.set(capture)
+    try:
+        yield capture
+    finally:
+        _current.reset(token)
+
+
+logger = logging.getLogger("discord.dev_command")
+logger.setLevel(logging.INFO)
+if not any(isinstance(h, CaptureHandler) for h in logger.handlers):
+    logger.addHandler(CaptureHandler())
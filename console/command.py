@@ -3,23 +3,39 @@ import platform
 import asyncio
 import os
 import io
+import gzip
+import time
+import math
+import datetime
+from typing import Any, Iterable
 
 import discord
 from discord.ext import commands
 
 from utils.common import *
+from utils.common import extension_manifest
+from utils.extension_loader import load_extensions
 from utils.config import Config
+from utils.capabilities import capabilities
+from utils.invite_cache import InviteCache, top_invite
+from utils.guild_stats import GuildCounts
+from utils.cache_profile import declare_feature
+from constants import *
+from . import capture
+from .log_store import LogStore, LogStoreHandler
 
 
 logger = logging.getLogger("discord.dev_command")
 
 
+declare_feature("server info show_members", "members")
+
+
 discord_logger = logging.getLogger("discord")
 discord_logger.setLevel(logging.INFO)
-discord_log_stream = io.StringIO()
-formatter = logging.Formatter('%(asctime)s [%(levelname)-8s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
-handler = logging.StreamHandler(discord_log_stream)
-handler.setFormatter(formatter)
+log_store = LogStore(LOG_CAPACITY)
+# Console output is not stored, or `export log` would re-store its own results
+handler = LogStoreHandler(log_store, exclude=(logger.name,))
 discord_logger.addHandler(handler)
 
 
@@ -39,26 +55,105 @@ async def say(bot: commands.Bot, channel_id: int, message_content: str) -> int:
     return 0
 
 
-async def export_log(bot: commands.Bot) -> int:
-    log_contents = discord_log_stream.getvalue() or None
-    if log_contents is None:
+async def export_log(
+    bot: commands.Bot,
+    level: str,
+    logger_name: str,
+    contains: str,
+    minutes: int,
+    page: int,
+    limit: int,
+    since: str,
+    until: str
+) -> int:
+    levelno = None
+    if level:
+        levelno = logging.getLevelName(level.upper())
+        if not isinstance(levelno, int):
+            logger.error(f"Unknown log level {level}")
+            return 1
+
+    if minutes > 0 and since:
+        logger.error("Use either minutes or since, not both")
+        return 1
+
+    # Absolute times are ISO 8601 (e.g. 2026-10-18T09:30), in local time unless they carry an offset
+    try:
+        since_time = datetime.datetime.fromisoformat(since).timestamp() if since else None
+        until_time = datetime.datetime.fromisoformat(until).timestamp() if until else None
+    except ValueError as e:
+        logger.error(f"Invalid time: {e}")
+        return 1
+    if minutes > 0:
+        since_time = time.time() - minutes * 60
+
+    entries = log_store.query(
+        level=levelno,
+        logger=logger_name or None,
+        since=since_time,
+        until=until_time,
+        contains=contains or None,
+        offset=(max(page, 1) - 1) * limit if limit > 0 else 0,
+        limit=limit if limit > 0 else None,
+    )
+    if not entries:
         logger.error("No output")
         return 1
-    else:
-        log_contents = "\n".join(f"- {line}" for line in log_contents.splitlines())
+
+    log_contents = "\n".join(f"- {line}" for entry in entries for line in entry.format().splitlines())
     logger.info(log_contents)
 
     return 0
 
 
 async def servers(bot: commands.Bot) -> int:
-    servers = len(bot.guilds)
-    
-    logger.info(f"Bot is in {servers} servers")
+    stats = bot.stats
+    summary = {
+        "guilds": stats.guilds,
+        "members": stats.members,
+        "humans": stats.humans,
+        "bots": stats.bots,
+        "channels": stats.channels,
+        "roles": stats.roles,
+        "shards": [(shard_id, stats.shard_guilds[shard_id], latency) for shard_id, latency in bot.shard_latencies()],
+    }
+    _publish(summary)
+
+    for line in format_servers(summary):
+        logger.info(line)
 
     return 0
 
 
+def format_servers(summary: dict) -> list[str]:
+    lines = [
+        f"Bot is in {summary['guilds']} servers",
+        f"- Members: {summary['members']} ({summary['humans']} humans, {summary['bots']} bots)",
+        f"- Channels: {summary['channels']}",
+        f"- Roles: {summary['roles']}",
+        "Shards:",
+    ]
+    for shard_id, guilds, latency in summary["shards"]:
+        lines.append(f"- Shard {shard_id}: {guilds} servers, {_format_latency(latency)}")
+    return lines
+
+
+def _publish(data: Any):
+    """
+    Hands a command's result to the active capture, so cluster workers can
+    return it to the supervisor for merging.
+    """
+    output = capture.current()
+    if output is not None:
+        output.data = data
+
+
+def _format_latency(latency: float) -> str:
+    if not math.isfinite(latency):
+        return "not connected"
+    return f"{latency * 1000:.0f} ms"
+
+
 async def create_invite(bot: commands.Bot, guild_id: int) -> int:
     guild = bot.get_guild(guild_id)
     if guild is None:
@@ -82,109 +177,167 @@ async def create_invite(bot: commands.Bot, guild_id: int) -> int:
     return 0
 
 
-async def server_info(bot: commands.Bot, guild_id: int, show_members: bool) -> int:
+async def server_info(bot: commands.Bot, guild_id: int, show_members: bool, page: int, limit: int) -> int:
     guild = bot.get_guild(guild_id)
     if guild is None:
         logger.error("Guild with ID %d not found.", guild_id)
         return 1
     
+    if show_members and not bot.feature_available("server info show_members"):
+        logger.warning("Member list is not cached with cache profile '%s'; showing counts only", bot.cache_profile.name)
+        show_members = False
+
+    if show_members and not await bot.member_chunker.ensure(guild):
+        logger.warning("Failed to fetch the member list; showing counts only")
+        show_members = False
+
     logger.info("Server info for %s (%d):", guild.name, guild.id)
     logger.info("- Owner: %s (%d)",
         getattr(guild.owner, "name", "Unknown"),
         getattr(guild.owner, "id", "Unknown")
     )
+    counts = bot.stats.get(guild.id) or GuildCounts(guild)
     if not show_members:
-        logger.info("- Members: %d", len(guild.members))
-    logger.info("- Channels: %d", len(guild.channels))
-    logger.info("- Roles: %d", len(guild.roles))
+        logger.info("- Members: %d (%d bots)", counts.members, counts.bots)
+    logger.info("- Channels: %d", counts.channels)
+    logger.info("- Roles: %d", counts.roles)
     logger.info("- Emojis: %d", len(guild.emojis))
 
-    if guild.me.guild_permissions.manage_guild:
-        try:
-            invites = await asyncio.wait_for(guild.invites(), timeout=10)
-        except asyncio.TimeoutError:
+    if InviteCache.can_fetch(guild):
+        invites = await bot.invite_cache.fetch(guild)
+        if invites is None:
             logger.error("Failed to fetch invites in time")
         else:
-            if invites != []:
-                invite: discord.Invite = max(invites, key=lambda i: i.uses or -1)
+            invite = top_invite(invites)
+            if invite is not None:
                 logger.info("- Invite: discord.gg/%s (%d uses)", invite.code, invite.uses)
 
-    members = list(guild.members)
-
-    if show_members and members:
-        members.sort(key=lambda m: (m.bot, m.name))
+    if show_members and guild.members:
+        members = bot.member_index.page(guild, page, limit)
         
-        logger.info("Members (%d):", len(guild.members))
+        if limit > 0:
+            logger.info("Members (%d, page %d):", counts.members, max(page, 1))
+        else:
+            logger.info("Members (%d):", counts.members)
 
-        for member in members:
-            logger.info("- %s (%d)%s", member.name, member.id, " [BOT]" if member.bot else "")
+        output = capture.current()
+        if output is not None and output.as_file:
+            filename = f"members-{guild.id}.txt.gz"
+            output.attachments.append(discord.File(_gzip_members(members), filename=filename))
+            logger.info("- Attached as %s", filename)
+        else:
+            for member in members:
+                logger.info("- %s (%d)%s", member.name, member.id, " [BOT]" if member.bot else "")
     
     return 0
 
 
+def _gzip_members(members: Iterable[discord.Member]) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb") as file:
+        for member in members:
+            file.write(f"- {member.name} ({member.id}){' [BOT]' if member.bot else ''}\n".encode())
+    buffer.seek(0)
+    return buffer
+
+
 async def server_list(bot: commands.Bot, fetch_invite: bool) -> int:
     servers = bot.guilds
     
     if not servers:
+        _publish([])
         logger.error("Bot is not in any servers.")
         return 1
 
-    logger.info("Server list:")
+    invites = {}
+    if fetch_invite:
+        invites = await bot.invite_cache.fetch_many(s for s in servers if InviteCache.can_fetch(s))
+
+    sharded = isinstance(bot, commands.AutoShardedBot)
+    latencies = dict(bot.shard_latencies())
+    if sharded:
+        servers = sorted(servers, key=lambda s: s.shard_id)
 
+    rows = []
     for server in servers:
-        line = f"- {server.name} ({server.id})"
+        row = {"name": server.name, "id": server.id, "shard": None, "invite": None}
+        if sharded:
+            shard_id = server.shard_id
+            row["shard"] = (shard_id, bot.stats.shard_guilds[shard_id], latencies.get(shard_id, math.nan))
 
         if fetch_invite:
-            line += ": "
-            invites = await server.invites()
-
-            if invites:
-                invite: discord.Invite = max(invites, key=lambda i: i.uses or -1)
-                line += f"{invite.code} ({invite.uses} uses)"
+            if server.id not in invites:
+                row["invite"] = "Missing Manage Server permission"
+            elif invites[server.id] is None:
+                row["invite"] = "Failed to fetch invites"
             else:
-                line += "No invites found"
-        
+                invite = top_invite(invites[server.id])
+                if invite is not None:
+                    row["invite"] = f"{invite.code} ({invite.uses} uses)"
+                else:
+                    row["invite"] = "No invites found"
+
+        rows.append(row)
+    _publish(rows)
+
+    for line in format_server_list(rows):
         logger.info(line)
     
     return 0
 
 
+def format_server_list(rows: list[dict]) -> list[str]:
+    lines = ["Server list:"]
+    current_shard = None
+    for row in rows:
+        if row["shard"] is not None and row["shard"][0] != current_shard:
+            current_shard, guilds, latency = row["shard"]
+            lines.append(f"Shard {current_shard} ({guilds} servers, {_format_latency(latency)}):")
+
+        line = f"- {row['name']} ({row['id']})"
+        if row["invite"] is not None:
+            line += f": {row['invite']}"
+        lines.append(line)
+    return lines
+
+
 async def reload(bot: commands.Bot, sync_tree: bool) -> int:
     logger.info("Reloading extensions")
 
-    extensions = list(get_extension())
+    extensions = await run_in_async(extension_manifest.scan)
 
-    for extension in extensions:
-        if extension in bot.extensions:
-            await bot.reload_extension(extension)
-        else:
-            await bot.load_extension(extension)
-        
-        for ext in bot.extensions:
-            if ext not in extensions:
-                await bot.unload_extension(ext)
+    for extension in [ext for ext in bot.extensions if ext not in extensions]:
+        await bot.unload_extension(extension)
+        logger.info(f"Unloaded extension {extension}")
 
-        logger.info(f"Reloaded extension {extension}")
+    # Reloads in dependency order; logs each extension and any failure
+    times = await load_extensions(bot, extensions, reload=True)
     
     if sync_tree:
-        await sync(bot)
+        await sync(bot, False)
     
+    if len(times) < len(extensions):
+        logger.error(f"Reloaded {len(times)}/{len(extensions)} extensions")
+        return 1
+
     logger.info("Successfully reloaded extensions")
 
     return 0
 
 
-async def sync(bot: commands.Bot) -> int:
-    await bot.tree.sync()
+async def sync(bot: commands.Bot, force: bool) -> int:
+    synced = await bot.tree_syncer.sync(bot, force)
 
-    logger.info("Synced tree")
+    if synced:
+        logger.info(f"Synced tree: {', '.join(synced)}")
+    else:
+        logger.info("Tree unchanged; nothing to sync")
 
     return 0
 
 
 async def clear(bot: commands.Bot) -> int:
-    discord_log_stream.seek(0)
-    discord_log_stream.truncate()
+    log_store.clear()
     
     pf = platform.system()
     if pf == "Windows":
@@ -216,18 +369,67 @@ async def leave(bot: commands.Bot, guild_id: int) -> int:
 async def maintenance(bot: commands.Bot, status: bool) -> int:
     logger.info(f"Setting maintenance status to {status}")
     
-    config = Config("config.json").load()
-    config.set("maintenance", status)
-
-    logger.info("Successfully set maintenance status")
+    config = await Config.shared(CONFIG_FILE).aload()
+    await config.aset("maintenance", status)
 
-    await reload(bot, False)
+    bot.dispatch("maintenance_update", status)
 
     logger.info(f"Set maintenance status to {status}")
 
     return 0
 
 
+async def probe(bot: commands.Bot, name: str) -> int:
+    names = [name] if name else capabilities.names()
+
+    for n in names:
+        try:
+            capability = await capabilities.probe(n)
+        except KeyError:
+            logger.error(f"Unknown executable {n}. Known: {', '.join(capabilities.names())}")
+            return 1
+
+        if capability.available:
+            logger.info(f"- {capability.name}: {capability.version} ({capability.path})")
+        else:
+            logger.info(f"- {capability.name}: not available")
+
+    return 0
+
+
+async def error_stats(bot: commands.Bot, reset: bool) -> int:
+    coalescer = bot.reply_coalescer
+
+    logger.info("Error replies:")
+    logger.info(f"- Sent: {coalescer.sent}")
+    logger.info(f"- Collapsed: {coalescer.suppressed}")
+    logger.info(f"- Dropped (channel burst): {coalescer.dropped}")
+    logger.info(f"- Summary edits: {coalescer.edits}")
+
+    for title, count in coalescer.suppressed_by_title.most_common(10):
+        logger.info(f"  - {title}: {count}")
+
+    if reset:
+        coalescer.reset()
+        logger.info("Reset counters")
+
+    return 0
+
+
+async def log_queue(bot: commands.Bot) -> int:
+    pipeline = bot.log_pipeline
+    if pipeline is None or not pipeline.running:
+        logger.info("Log queue is disabled")
+        return 0
+
+    logger.info(f"Log queue: {pipeline.qsize()}/{pipeline.capacity} ({pipeline.overflow})")
+    logger.info(f"- Dropped: {sum(pipeline.dropped.values())}")
+    for levelname, count in pipeline.dropped.items():
+        logger.info(f"  - {levelname}: {count}")
+
+    return 0
+
+
 async def stop(bot: commands.Bot) -> int:
     logger.info("Stopping bot...")
 
@@ -8,37 +8,64 @@ from discord.ext import commands
 logger = logging.getLogger("discord.console")
 
 
+def _to_bool(value: str) -> bool:
+    if value.lower() in ["true", "yes", "1"]:
+        return True
+    elif value.lower() in ["false", "no", "0"]:
+        return False
+    raise ValueError(value)
+
+
 class CsCommand:
     def __init__(self, name: str):
         self.name = name
         self.arguments: Dict[str, Tuple[type, Optional[Any]]] = {}
         self.function: Optional[Callable[..., Any]] = None
+        self._converters: List[Tuple[str, Callable[[str], Any], type]] = []
 
     def add_argument(self, name: str, type: type, default: Optional[Any] = None):
         self.arguments[name] = (type, default)
+        self._converters = [
+            (arg_name, _to_bool if arg_type == bool else arg_type, arg_type)
+            for arg_name, (arg_type, _) in self.arguments.items()
+        ]
 
     def set_function(self, function: Callable[..., Any]):
         self.function = function
 
     async def execute(self, bot: commands.Bot, args: List[str]) -> Any:
-        if len(args) > len(self.arguments):
-            raise ValueError(f"Expected at most {len(self.arguments)} arguments but got {len(args)}.")
+        # Options: "--name=value", or "--name" for bool arguments
+        options = {}
+        positional = []
+        for arg in args:
+            name, sep, value = arg[2:].partition("=")
+            if arg.startswith("--") and name in self.arguments:
+                if not sep and self.arguments[name][0] != bool:
+                    raise ValueError(f"Option '--{name}' requires a value.")
+                options[name] = value if sep else "true"
+            else:
+                positional.append(arg)
+
+        if len(positional) > len(self.arguments):
+            raise ValueError(f"Expected at most {len(self.arguments)} arguments but got {len(positional)}.")
 
         parsed_args = {}
-        for (name, (type, default)), value in zip(self.arguments.items(), args):
+        values = iter(positional)
+        for name, converter, type in self._converters:
+            value = options.get(name)
+            if value is None:
+                value = next(values, None)
+                if value is None:
+                    continue
             try:
-                if type == bool:
-                    if value.lower() in ["true", "yes", "1"]:
-                        parsed_args[name] = True
-                    elif value.lower() in ["false", "no", "0"]:
-                        parsed_args[name] = False
-                    else:
-                        raise ValueError(f"Argument '{name}' must be of type {type.__name__}.")
-                else:
-                    parsed_args[name] = type(value)
+                parsed_args[name] = converter(value)
             except ValueError:
                 raise ValueError(f"Argument '{name}' must be of type {type.__name__}.")
 
+        leftover = list(values)
+        if leftover:
+            raise ValueError(f"Unexpected arguments: {' '.join(leftover)}")
+
         for name, (type, default) in self.arguments.items():
             if name not in parsed_args:
                 if default is not None:
@@ -50,33 +77,62 @@ class CsCommand:
             return await self.function(bot, **parsed_args)
 
 
+class _TrieNode:
+    __slots__ = ("children", "command")
+
+    def __init__(self):
+        self.children: Dict[str, _TrieNode] = {}
+        self.command: Optional[CsCommand] = None
+
+
 class Cs:
     __commands: Dict[str, CsCommand]
 
     def __init__(self):
         self.__commands = {}
+        self.__trie = _TrieNode()
 
     def get_commands(self) -> Dict[str, CsCommand]:
         return self.__commands
 
     def add_command(self, command: CsCommand):
         self.__commands[command.name] = command
-    
+
+        node = self.__trie
+        for token in command.name.split():
+            node = node.children.setdefault(token, _TrieNode())
+        node.command = command
+
     def remove_command(self, command_name: str):
         del self.__commands[command_name]
 
-    async def execute_command(self, bot: commands.Bot, command_string: str) -> Any:
-        command_name: Optional[str] = None
-        args: List[str] = []
-
-        for name in sorted(self.__commands.keys(), key=len, reverse=True):
-            if command_string.startswith(name):
-                command_name = name
-                args = shlex.split(command_string[len(name):].strip())
+        node = self.__trie
+        for token in command_name.split():
+            node = node.children[token]
+        node.command = None
+
+    def resolve(self, tokens: List[str]) -> Tuple[Optional[CsCommand], List[str]]:
+        """
+        Finds the command with the longest multi-word name matching the start of `tokens`.
+        """
+        node = self.__trie
+        command: Optional[CsCommand] = None
+        depth = 0
+
+        for i, token in enumerate(tokens):
+            node = node.children.get(token)
+            if node is None:
                 break
+            if node.command is not None:
+                command, depth = node.command, i + 1
+
+        return command, tokens[depth:]
+
+    async def execute_command(self, bot: commands.Bot, command_string: str) -> Any:
+        command, args = self.resolve(shlex.split(command_string))
 
-        if command_name and command_name in self.__commands:
-            logger.info(f"> {command_name} {' '.join(args)}")
-            return await self.__commands[command_name].execute(bot, args)
+        if command is not None:
+            logger.info(f"> {command.name} {' '.join(args)}")
+            return await command.execute(bot, args)
         else:
             raise ValueError(f"Command '{command_string}' not found.")
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+from collections import deque
+from typing import Iterable, Iterator
+
+
+class LogEntry:
+    __slots__ = ("seq", "created", "levelno", "levelname", "name", "message")
+
+    def __init__(self, seq: int, created: float, levelno: int, levelname: str, name: str, message: str):
+        self.seq = seq
+        self.created = created
+        self.levelno = levelno
+        self.levelname = levelname
+        self.name = name
+        self.message = message
+
+    def format(self) -> str:
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.created))
+        return f"{timestamp} [{self.levelname:<8}] {self.message}"
+
+
+class LogStore:
+    """
+    A fixed-capacity ring buffer of log records.
+
+    Once full, each new record overwrites the oldest one. Per-level indexes and
+    the time ordering of the buffer let `query` jump to matching records
+    instead of scanning or copying the whole history.
+
+    Records from different threads can arrive slightly out of time order. While
+    such a record is in the buffer, time ranges are matched by a linear scan
+    instead of a binary search.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of records kept.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._entries: list[LogEntry | None] = [None] * capacity
+        self._by_level: dict[int, deque[int]] = {}
+        self._next_seq = 0
+        # The newest record that is earlier than the record before it
+        self._unordered_seq = -1
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._next_seq - self._first_seq
+
+    @property
+    def _first_seq(self) -> int:
+        return max(0, self._next_seq - self.capacity)
+
+    def append(self, created: float, levelno: int, levelname: str, name: str, message: str):
+        with self._lock:
+            seq = self._next_seq
+            if seq > 0 and created < self._get(seq - 1).created:
+                self._unordered_seq = seq
+            self._entries[seq % self.capacity] = LogEntry(seq, created, levelno, levelname, name, message)
+            index = self._by_level.get(levelno)
+            if index is None:
+                index = self._by_level[levelno] = deque()
+            index.append(seq)
+            self._next_seq += 1
+
+            first_seq = self._first_seq
+            for index in self._by_level.values():
+                while index and index[0] < first_seq:
+                    index.popleft()
+
+    def clear(self):
+        with self._lock:
+            self._entries = [None] * self.capacity
+            self._by_level.clear()
+            self._next_seq = 0
+            self._unordered_seq = -1
+
+    def _get(self, seq: int) -> LogEntry:
+        return self._entries[seq % self.capacity]
+
+    def _bisect_time(self, timestamp: float) -> int:
+        lo, hi = self._first_seq, self._next_seq
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._get(mid).created < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _candidates(self, level: int | None) -> Iterator[int]:
+        """Yields candidate sequence numbers, newest first."""
+        if level is None:
+            return iter(range(self._next_seq - 1, self._first_seq - 1, -1))
+
+        indexes: Iterable[deque[int]] = [
+            index for levelno, index in self._by_level.items() if levelno >= level
+        ]
+        return heapq.merge(*(reversed(index) for index in indexes), reverse=True)
+
+    def query(
+        self,
+        level: int | None = None,
+        logger: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        contains: str | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[LogEntry]:
+        """
+        Returns matching records in chronological order.
+
+        Matches are counted from the newest record, so `offset=0` with a `limit`
+        gives the most recent page.
+
+        Parameters
+        ----------
+        level : int | None
+            The minimum level.
+        logger : str | None
+            The logger name; child loggers match too.
+        since, until : float | None
+            The time range, as UNIX timestamps. `until` is exclusive.
+        contains : str | None
+            A substring the message must contain.
+        offset : int
+            The number of newest matches to skip.
+        limit : int | None
+            The maximum number of records returned.
+        """
+        with self._lock:
+            lo, hi = self._first_seq, self._next_seq
+            # Bisecting needs every record in the buffer to be in time order
+            if self._unordered_seq <= self._first_seq:
+                if since is not None:
+                    lo = self._bisect_time(since)
+                if until is not None:
+                    hi = self._bisect_time(until)
+            prefix = logger + "." if logger else None
+
+            result: list[LogEntry] = []
+            skipped = 0
+            for seq in self._candidates(level):
+                if seq >= hi:
+                    continue
+                if seq < lo:
+                    break
+
+                entry = self._get(seq)
+                if since is not None and entry.created < since:
+                    continue
+                if until is not None and entry.created >= until:
+                    continue
+                if logger and entry.name != logger and not entry.name.startswith(prefix):
+                    continue
+                if contains and contains not in entry.message:
+                    continue
+
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                result.append(entry)
+                if limit is not None and len(result) >= limit:
+                    break
+
+        result.reverse()
+        return result
+
+
+class LogStoreHandler(logging.Handler):
+    """
+    Appends records to a `LogStore`.
+
+    Records from the `exclude` loggers (and their children) are not stored, so
+    console output such as `export log` results is not fed back into the store.
+    Messages longer than `max_length` characters are truncated.
+    """
+
+    def __init__(
+        self,
+        store: LogStore,
+        level: int = logging.NOTSET,
+        exclude: Iterable[str] = (),
+        max_length: int = 4000
+    ):
+        super().__init__(level)
+        self.store = store
+        self.exclude = tuple(exclude)
+        self.max_length = max_length
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        name = record.name
+        if any(name == excluded or name.startswith(excluded + ".") for excluded in self.exclude):
+            return False
+        return super().filter(record)
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            message = record.getMessage()
+            if record.exc_info:
+                message += "\n" + logging.Formatter().formatException(record.exc_info)
+            elif record.exc_text:
+                message += "\n" + record.exc_text
+            if len(message) > self.max_length:
+                message = f"{message[:self.max_length]}... ({len(message) - self.max_length} characters truncated)"
+            self.store.append(record.created, record.levelno, record.levelname, record.name, message)
+        except Exception:
+            self.handleError(record)
@@ -2,6 +2,19 @@ from .console import Cs, CsCommand
 from . import command
 
 
+_console: Cs | None = None
+
+
+def get_console() -> Cs:
+    """
+    Returns the console shared by the whole process, registering its commands on first use.
+    """
+    global _console
+    if _console is None:
+        _console = register_commands()
+    return _console
+
+
 def register_commands():
     console = Cs()
 
@@ -12,6 +25,14 @@ def register_commands():
     console.add_command(command_say)
 
     command_export_log = CsCommand("export log")
+    command_export_log.add_argument("level", str, "")
+    command_export_log.add_argument("logger_name", str, "")
+    command_export_log.add_argument("contains", str, "")
+    command_export_log.add_argument("minutes", int, 0)
+    command_export_log.add_argument("page", int, 1)
+    command_export_log.add_argument("limit", int, 0)
+    command_export_log.add_argument("since", str, "")
+    command_export_log.add_argument("until", str, "")
     command_export_log.set_function(command.export_log)
     console.add_command(command_export_log)
 
@@ -27,6 +48,8 @@ def register_commands():
     command_server_info = CsCommand("server info")
     command_server_info.add_argument("guild_id", int)
     command_server_info.add_argument("show_members", bool, False)
+    command_server_info.add_argument("page", int, 1)
+    command_server_info.add_argument("limit", int, 0)
     command_server_info.set_function(command.server_info)
     console.add_command(command_server_info)
 
@@ -41,6 +64,7 @@ def register_commands():
     console.add_command(command_reload)
 
     command_sync = CsCommand("sync")
+    command_sync.add_argument("force", bool, False)
     command_sync.set_function(command.sync)
     console.add_command(command_sync)
 
@@ -58,6 +82,20 @@ def register_commands():
     command_maintenance.set_function(command.maintenance)
     console.add_command(command_maintenance)
 
+    command_probe = CsCommand("probe")
+    command_probe.add_argument("name", str, "")
+    command_probe.set_function(command.probe)
+    console.add_command(command_probe)
+
+    command_error_stats = CsCommand("error stats")
+    command_error_stats.add_argument("reset", bool, False)
+    command_error_stats.set_function(command.error_stats)
+    console.add_command(command_error_stats)
+
+    command_log_queue = CsCommand("log queue")
+    command_log_queue.set_function(command.log_queue)
+    console.add_command(command_log_queue)
+
     command_stop = CsCommand("stop")
     command_stop.set_function(command.stop)
     console.add_command(command_stop)
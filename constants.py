@@ -1,2 +1,7 @@
 CONFIG_FILE = "./config.json"
-TOKEN_FILE = "./token.json"
\ No newline at end of file
+TOKEN_FILE = "./token.json"
+IMAGE_DIR = "./res/images"
+LOG_CAPACITY = 10000
+TREE_SYNC_FILE = "./tree_sync.json"
+EXTENSION_DIR = "extensions"
+EXTENSION_MANIFEST_FILE = "./extension_manifest.json"
@@ -1,71 +1,76 @@
-from typing import Union
+from typing import Hashable, Union
 
 import discord
 from discord.ext import commands
 
 from utils import local_file
+from utils.embed_template import EmbedTemplate
+from utils.error_handler import error_handler
 from utils.exceptions import *
 from kurd_dx import KurdDX
 from base_cog import BaseCog
 
 
+TRANSFORMER_ERROR = EmbedTemplate("Transformer Error", thumbnail="res/images/error.png")
+PERMISSION_ERROR = EmbedTemplate("Permission Error", thumbnail="res/images/permission.png")
+CHECK_FAILURE = EmbedTemplate("Check Failure", thumbnail="res/images/error.png")
+ARGUMENT_ERROR = EmbedTemplate("Argument Error", thumbnail="res/images/error.png")
+VALUE_ERROR = EmbedTemplate("Value Error", thumbnail="res/images/error.png")
+MISSING_REQUIRED_ARGUMENT = EmbedTemplate("Missing Required Argument", thumbnail="res/images/error.png")
+MISSING_REQUIRED_ATTACHMENT = EmbedTemplate("Missing Required Attachment", thumbnail="res/images/error.png")
+RESOURCE_NOT_FOUND = EmbedTemplate("Resource Not Found", thumbnail="res/images/error.png")
+EXECUTABLE_NOT_FOUND = EmbedTemplate("Executable Not Found", thumbnail="res/images/error.png")
+MAINTENANCE = EmbedTemplate("Maintenance", thumbnail="res/images/maintenance.png")
+OUT_OF_RANGE = EmbedTemplate("Out of Range", thumbnail="res/images/error.png")
+INVALID_SUBCOMMAND = EmbedTemplate("Invalid Subcommand", thumbnail="res/images/error.png")
+COMMAND_ON_COOLDOWN = EmbedTemplate("Command is on cooldown")
+UNEXPECTED_ERROR = EmbedTemplate("Unexpected Error", thumbnail="res/images/unexpected_error.png")
+
+
 class Exception_EXT(BaseCog):
     @staticmethod
-    async def reply(ctx: commands.Context, *args, **kwargs) -> discord.Message:
-        await ctx.reply(*args, **kwargs, mention_author=False)
+    async def reply(ctx: commands.Context, *args, detail: Hashable = None, **kwargs) -> discord.Message | None:
+        async def send() -> discord.Message:
+            message = await ctx.reply(*args, **kwargs, mention_author=False)
+            local_file.assets.record_upload(message, kwargs.get("file"))
+            return message
+
+        # Interactions must always be answered, so only prefix commands are coalesced
+        embed = kwargs.get("embed")
+        if ctx.interaction is not None or embed is None:
+            return await send()
+
+        kind = ctx.command.qualified_name if ctx.command is not None else ctx.invoked_with
+        return await ctx.bot.reply_coalescer.send(ctx.channel.id, ctx.author.id, embed, send, kind, detail)
     
     @commands.Cog.listener("on_command_error")
     async def on_command_error_event(self, ctx: commands.Context, error: commands.CommandError):
-        if isinstance(error, commands.errors.CommandOnCooldown):
-            return await self.on_command_cooldown_error(ctx, error)
-        
-        if ctx.command is not None:
+        if ctx.command is not None and not isinstance(error, commands.errors.CommandOnCooldown):
             ctx.command.reset_cooldown(ctx)
         
-        if isinstance(error,KurdDXError): # KurdDXError (util/exceptions.py)
-            if isinstance(error.original,ResourceNotFoundError):
-                return await self.on_resource_not_found_error(ctx, error.original)
-            elif isinstance(error.original,ExecutableNotFoundError):
-                return await self.on_executable_not_found_error(ctx, error.original)
-            elif isinstance(error.original,MaintenanceError):
-                return await self.on_maintenance_error(ctx, error.original)
-            elif isinstance(error.original,OutOfRangeError):
-                return await self.on_out_of_range_error(ctx, error.original)
-            elif isinstance(error.original,InvalidSubcommandError):
-                return await self.on_invalid_subcommand_error(ctx, error.original)
-            
-        elif isinstance(error, commands.errors.HybridCommandError): # HybridCommandError
-            if isinstance(error.original, discord.app_commands.TransformerError):
-                return await self.on_transformer_error(ctx, error.original)
-        
-        elif isinstance(error, commands.MissingPermissions):
-            return await self.on_permission_error(ctx, error)
-        elif isinstance(error, commands.CheckFailure):
-            return await self.on_check_failure_error(ctx, error)
-        elif isinstance(error, commands.BadArgument):
-            return await self.on_bad_argument_error(ctx, error)
-        elif isinstance(error, commands.errors.CommandInvokeError):
-            return await self.on_command_invoke_error(ctx, error)
-        elif isinstance(error, commands.errors.MissingRequiredArgument):
-            return await self.on_missing_required_argument_error(ctx, error)
-        elif isinstance(error, commands.errors.MissingRequiredAttachment):
-            return await self.on_missing_required_attachment_error(ctx, error)
-        elif isinstance(error, commands.CommandNotFound):
-            return # Ignore
+        # KurdDXError (util/exceptions.py) and HybridCommandError are dispatched on the wrapped error
+        if isinstance(error, (KurdDXError, commands.errors.HybridCommandError)):
+            target = error.original
+        else:
+            target = error
+
+        handler = self.bot.error_handlers.resolve(type(target))
+        if handler is not None:
+            return await handler(ctx, target)
 
         await self.on_unexpected_error(ctx, error)
         raise error
     
+    @error_handler(commands.CommandNotFound)
+    async def on_command_not_found_error(self, ctx: commands.Context, error: commands.CommandNotFound):
+        return # Ignore
+    
+    @error_handler(discord.app_commands.TransformerError)
     async def on_transformer_error(self, ctx: commands.Context, error: discord.app_commands.TransformerError):
-        embed = discord.Embed(
-            title="Transformer Error",
-            description=str(error),
-            color=discord.Color.teal()
-        )
-        url, file = local_file.attach("res/images/error.png")
-        embed.set_thumbnail(url=url)
+        embed, file = TRANSFORMER_ERROR.render(str(error))
         await self.reply(ctx, embed=embed, file=file)
     
+    @error_handler(commands.MissingPermissions, commands.BotMissingPermissions)
     async def on_permission_error(self, ctx: commands.Context, error: Union[commands.MissingPermissions, commands.BotMissingPermissions]):
         if isinstance(error, commands.MissingPermissions):
             message = "You are missing the following permissions"
@@ -76,35 +81,20 @@ class Exception_EXT(BaseCog):
         
         message += f"```{', '.join(error.missing_permissions)}```"
 
-        embed = discord.Embed(
-            title="Permission Error",
-            description=message,
-            color=discord.Color.teal()
-        )
-        url, file = local_file.attach("res/images/permission.png")
-        embed.set_thumbnail(url=url)
+        embed, file = PERMISSION_ERROR.render(message)
         await self.reply(ctx, embed=embed, file=file)
 
+    @error_handler(commands.CheckFailure)
     async def on_check_failure_error(self, ctx: commands.Context, error: commands.CheckFailure):
-        embed = discord.Embed(
-            title="Check Failure",
-            description=str(error),
-            color=discord.Color.teal()
-        )
-        url, file = local_file.attach("res/images/error.png")
-        embed.set_thumbnail(url=url)
+        embed, file = CHECK_FAILURE.render(str(error))
         await self.reply(ctx, embed=embed, file=file)
 
+    @error_handler(commands.BadArgument)
     async def on_bad_argument_error(self, ctx: commands.Context, error: commands.BadArgument):
-        embed = discord.Embed(
-            title="Argument Error",
-            description=str(error),
-            color=discord.Color.teal()
-        )
-        url, file = local_file.attach("res/images/error.png")
-        embed.set_thumbnail(url=url)
+        embed, file = ARGUMENT_ERROR.render(str(error))
         await self.reply(ctx, embed=embed, file=file)
 
+    @error_handler(commands.errors.CommandOnCooldown)
     async def on_command_cooldown_error(self, ctx: commands.Context, error: commands.CommandOnCooldown):
         cooldown_seconds = int(error.retry_after)
 
@@ -120,119 +110,73 @@ class Exception_EXT(BaseCog):
         if cooldown_time == "": cooldown_time = "0 seconds"
         cooldown_time = cooldown_time.rstrip()
 
-        embed = discord.Embed(
-            title="Command is on cooldown",
-            description=f"Please try again in `{cooldown_time}`",
-            color=discord.Color.teal()
-        )
-        await self.reply(ctx, embed=embed)
+        embed, _ = COMMAND_ON_COOLDOWN.render(f"Please try again in `{cooldown_time}`")
+        # The remaining time changes every second; repeats still count as the same reply
+        await self.reply(ctx, embed=embed, detail=error.type)
     
+    @error_handler(commands.errors.CommandInvokeError)
     async def on_command_invoke_error(self, ctx: commands.Context, error: commands.errors.CommandInvokeError):
         if isinstance(error.original, ValueError):
             return await self.on_value_error(ctx, error.original)
     
     async def on_value_error(self, ctx: commands.Context, error: ValueError):
-        embed = discord.Embed(
-            title="Value Error",
-            description=str(error),
-            color=discord.Color.teal()
-        )
-        url, file = local_file.attach("res/images/error.png")
-        embed.set_thumbnail(url=url)
+        embed, file = VALUE_ERROR.render(str(error))
         await self.reply(ctx, embed=embed, file=file)
     
+    @error_handler(commands.errors.MissingRequiredArgument)
     async def on_missing_required_argument_error(self, ctx: commands.Context, error: commands.errors.MissingRequiredArgument):
-        embed = discord.Embed(
-            title="Missing Required Argument",
-            description=str(error),
-            color=discord.Color.teal()
-        )
-        embed.add_field(
-            name="Usage",
-            value=f"```{ctx.prefix}{ctx.command.name} {ctx.command.signature}```"
+        embed, file = MISSING_REQUIRED_ARGUMENT.render(
+            str(error),
+            [("Usage", f"```{ctx.prefix}{ctx.command.name} {ctx.command.signature}```", True)]
         )
-        url, file = local_file.attach("res/images/error.png")
-        embed.set_thumbnail(url=url)
         await self.reply(ctx, embed=embed, file=file)
 
+    @error_handler(commands.errors.MissingRequiredAttachment)
     async def on_missing_required_attachment_error(self, ctx: commands.Context, error: commands.errors.MissingRequiredAttachment):
-        embed = discord.Embed(
-            title="Missing Required Attachment",
-            description=str(error),
-            color=discord.Color.teal()
+        embed, file = MISSING_REQUIRED_ATTACHMENT.render(
+            str(error),
+            [("Usage", f"```{ctx.prefix}{ctx.command.name} {ctx.command.signature}```", True)]
         )
-        embed.add_field(
-            name="Usage",
-            value=f"```{ctx.prefix}{ctx.command.name} {ctx.command.signature}```"
-        )
-        url, file = local_file.attach("res/images/error.png")
-        embed.set_thumbnail(url=url)
         await self.reply(ctx, embed=embed, file=file)
     
+    @error_handler(ResourceNotFoundError)
     async def on_resource_not_found_error(self, ctx: commands.Context, error:ResourceNotFoundError):
-        embed = discord.Embed(
-            title="Resource Not Found",
-            description=str(error),
-            color=discord.Color.teal()
-        )
-        url, file = local_file.attach("res/images/error.png")
-        embed.set_thumbnail(url=url)
+        embed, file = RESOURCE_NOT_FOUND.render(str(error))
         await self.reply(ctx, embed=embed, file=file)
     
+    @error_handler(ExecutableNotFoundError)
     async def on_executable_not_found_error(self, ctx: commands.Context, error:ExecutableNotFoundError):
-        embed = discord.Embed(
-            title="Executable Not Found",
-            description=str(error),
-            color=discord.Color.teal()
-        )
-        url, file = local_file.attach("res/images/error.png")
-        embed.set_thumbnail(url=url)
+        embed, file = EXECUTABLE_NOT_FOUND.render(str(error))
         await self.reply(ctx, embed=embed, file=file)
     
+    @error_handler(MaintenanceError)
     async def on_maintenance_error(self, ctx: commands.Context, error:MaintenanceError):
-        embed = discord.Embed(
-            title="Maintenance",
-            description=str(error),
-            color=discord.Color.teal()
-        )
-        url, file = local_file.attach("res/images/maintenance.png")
-        embed.set_thumbnail(url=url)
+        embed, file = MAINTENANCE.render(str(error))
         await self.reply(ctx, embed=embed, file=file)
     
+    @error_handler(OutOfRangeError)
     async def on_out_of_range_error(self, ctx: commands.Context, error:OutOfRangeError):
-        embed = discord.Embed(
-            title="Out of Range",
-            description=str(error),
-            color=discord.Color.teal()
+        embed, file = OUT_OF_RANGE.render(
+            str(error),
+            [
+                ("Value", f"```{error.value}```", False),
+                ("Minimum Value", f"```{error.min_value}```", False),
+                ("Maximum Value", f"```{error.max_value}```", False),
+            ]
         )
-        embed.add_field(name="Value", value=f"```{error.value}```", inline=False)
-        embed.add_field(name="Minimum Value", value=f"```{error.min_value}```", inline=False)
-        embed.add_field(name="Maximum Value", value=f"```{error.max_value}```", inline=False)
-        url, file = local_file.attach("res/images/error.png")
-        embed.set_thumbnail(url=url)
         await self.reply(ctx, embed=embed, file=file)
     
+    @error_handler(InvalidSubcommandError)
     async def on_invalid_subcommand_error(self, ctx: commands.Context, error:InvalidSubcommandError):
         if error.given_subcommand_name is None:
             description = f"{error.group.name} group must have a subcommand"
         else:
             description = f"{error.group.name} group does not have a subcommand named `{error.given_subcommand_name}`"
 
-        embed = discord.Embed(
-            title="Invalid Subcommand",
-            description=description,
-            color=discord.Color.teal()
-        )
-        url, file = local_file.attach("res/images/error.png")
-        embed.set_thumbnail(url=url)
+        embed, file = INVALID_SUBCOMMAND.render(description)
         await self.reply(ctx, embed=embed, file=file)
     
     async def on_unexpected_error(self, ctx: commands.Context, error: Exception):
-        embed = discord.Embed(
-            title="Unexpected Error",
-            color=discord.Color.teal()
-        )
-
         name = ""
         error_ = error
         count = 0
@@ -247,11 +191,10 @@ class Exception_EXT(BaseCog):
         if not error_string:
             error_string = "No error message"
         
-        embed.add_field(name=name, value=f"```{error_string}```", inline=False)
-        embed.add_field(name="Stack Trace", value=f"```{error_.__traceback__}```", inline=False)
-
-        url, file = local_file.attach("res/images/unexpected_error.png")
-        embed.set_thumbnail(url=url)
+        embed, file = UNEXPECTED_ERROR.render(fields=[
+            (name, f"```{error_string}```", False),
+            ("Stack Trace", f"```{error_.__traceback__}```", False),
+        ])
         await self.reply(ctx, embed=embed, file=file)
 
 
@@ -3,62 +3,197 @@ import io
 
 from discord.ext import commands, tasks
 
-from utils import predicates
+from utils import local_file, predicates
+from utils.presence import PresenceUpdater
 from utils.exceptions import *
-from console.register_commands import register_commands
+from console.register_commands import get_console
+from console.capture import capture_output
 from kurd_dx import KurdDX
 from base_cog import BaseCog
 
 
 class KurdDX_EXT(BaseCog):
     async def on_init(self):
+        if self.bot.is_ready():
+            self.bot.stats.rebuild(self.bot.guilds)
+
+        self.presence = PresenceUpdater(
+            self.render_presence,
+            self.send_presence,
+            debounce=self.bot.config.get("presence_debounce", 5),
+        )
         self.update_presence.start()
+        self.evict_member_caches.start()
         self.bot.before_invoke(self.check_maintenance)
     
     @tasks.loop(minutes=10)
     async def update_presence(self):
-        activity = discord.Game(name=f"{len(self.bot.guilds)} servers")
-        status = discord.Status.online
-
-        config = self.bot.config
-        config.load()
-        
-        is_maintenance = config.get("maintenance", False)
-
-        if is_maintenance:
-            activity = discord.Game(name="Maintenance")
-            status = discord.Status.do_not_disturb
-        
-        await self.bot.change_presence(activity=activity, status=status)
+        # Fallback only; changes are pushed from events. This also picks up maintenance
+        # toggled by editing config.json, and unchanged presence is not sent.
+        await self.bot.config.arefresh()
+        await self.presence.push_all(self.presence_shards())
+
+    @update_presence.before_loop
+    async def before_update_presence(self):
+        # Extensions load before login; presence needs the gateway connection
+        await self.bot.wait_until_ready()
+
+    def presence_shards(self) -> list[int | None]:
+        if isinstance(self.bot, commands.AutoShardedBot):
+            return [shard_id for shard_id, shard in self.bot.shards.items() if not shard.is_closed()]
+        return [None]
+
+    def render_presence(self, shard_id: int | None) -> tuple[discord.Game, discord.Status]:
+        if self.bot.config.get("maintenance", False):
+            return discord.Game(name="Maintenance"), discord.Status.do_not_disturb
+
+        name = f"{self.bot.stats.guilds} servers"
+        if shard_id is not None:
+            name += f" | Shard {shard_id}"
+        return discord.Game(name=name), discord.Status.online
+
+    async def send_presence(self, activity: discord.Game, status: discord.Status, shard_id: int | None):
+        if shard_id is None:
+            await self.bot.change_presence(activity=activity, status=status)
+        else:
+            await self.bot.change_presence(activity=activity, status=status, shard_id=shard_id)
+    
+    @tasks.loop(minutes=1)
+    async def evict_member_caches(self):
+        for guild_id in self.bot.member_chunker.evict_idle(self.bot.get_guild):
+            self.bot.member_index.drop(guild_id)
+
+    async def cog_unload(self):
+        self.update_presence.cancel()
+        self.presence.cancel()
+        self.evict_member_caches.cancel()
+        await super().cog_unload()
     
     async def check_maintenance(self, ctx: commands.Context):
         cs_command = self.bot.get_command("cs")
         if cs_command and ctx.command == cs_command:
             return
         
-        config = self.bot.config
-        config.load()
+        config = await self.bot.config.arefresh()
 
-        is_dev = ctx.author.id in config.get("developers", [])
+        is_dev = predicates.is_developer(ctx.author, config)
         is_maintenance = config.get("maintenance", False)
         
         if is_maintenance and not is_dev:
             raise KurdDXError(MaintenanceError())
 
-    @commands.command("cs")
-    @predicates.dev_only()
-    async def cs_command(self, ctx: commands.Context, *, command: str):
-        logger = logging.getLogger("discord.dev_command")
-        logger.setLevel(logging.INFO)
-        log_stream = io.StringIO()
-        handler = logging.StreamHandler(log_stream)
-        logger.addHandler(handler)
+    @commands.Cog.listener()
+    async def on_invite_create(self, invite: discord.Invite):
+        if invite.guild is not None:
+            self.bot.invite_cache.invalidate(invite.guild.id)
+
+    @commands.Cog.listener()
+    async def on_invite_delete(self, invite: discord.Invite):
+        if invite.guild is not None:
+            self.bot.invite_cache.invalidate(invite.guild.id)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self.bot.stats.rebuild(self.bot.guilds)
+        self.presence.schedule(self.presence_shards)
+
+    @commands.Cog.listener()
+    async def on_shard_ready(self, shard_id: int):
+        # Presence set per shard is not kept across a shard's reconnect
+        if self.update_presence.is_running():
+            self.presence.forget(shard_id)
+            await self.presence.push(shard_id)
+
+    @commands.Cog.listener()
+    async def on_maintenance_update(self, status: bool):
+        self.presence.schedule(self.presence_shards, delay=0)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        self.bot.stats.add_guild(guild)
+        self.presence.schedule(self.presence_shards)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.bot.stats.remove_guild(guild)
+        self.bot.member_index.drop(guild.id)
+        self.bot.invite_cache.invalidate(guild.id)
+        self.presence.schedule(self.presence_shards)
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild):
+        # Guilds that arrive after READY (outages, lazy loading, late shards) fire this, not on_guild_join
+        self.bot.stats.add_guild(guild)
+        self.presence.schedule(self.presence_shards)
+
+    @commands.Cog.listener()
+    async def on_guild_unavailable(self, guild: discord.Guild):
+        self.bot.stats.remove_guild(guild)
+        self.presence.schedule(self.presence_shards)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self.bot.stats.member_joined(member)
+        self.bot.member_index.add(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.bot.stats.member_left(member)
+        self.bot.member_index.remove(member)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        self.bot.member_index.rename(before, after)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        local_file.assets.forget_message(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        for message_id in payload.message_ids:
+            local_file.assets.forget_message(message_id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        self.bot.stats.channel_created(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        self.bot.stats.channel_deleted(channel)
+        local_file.assets.forget_channel(channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        self.bot.stats.role_created(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self.bot.stats.role_deleted(role)
+
+    async def run_console(self, ctx: commands.Context, command: str, timestamps: bool, as_file: bool):
+        formatter = None
+        if timestamps:
+            formatter = logging.Formatter("%(asctime)s [%(levelname)-8s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
 
         async with ctx.typing():
-            console = register_commands()
-            await console.execute_command(self.bot, command)
+            with capture_output(formatter, as_file) as capture:
+                await get_console().execute_command(self.bot, command)
+
+            log_contents = capture.getvalue() or None
+
+            if as_file:
+                if log_contents is None and not capture.attachments:
+                    await ctx.send("No output")
+                    return
 
-            log_contents = log_stream.getvalue() or "No output"
+                files = list(capture.attachments)
+                if log_contents is not None:
+                    files.insert(0, discord.File(io.StringIO(log_contents), filename="log.txt"))
+                await ctx.message.reply(files=files, mention_author=False)
+                return
+
+            log_contents = log_contents or "No output"
             content = f"```{log_contents}```"
             
             if len(content) > 2000:
@@ -66,76 +201,25 @@ class KurdDX_EXT(BaseCog):
             else:
                 await ctx.message.reply(content, mention_author=False)
 
+    @commands.command("cs")
+    @predicates.dev_only()
+    async def cs_command(self, ctx: commands.Context, *, command: str):
+        await self.run_console(ctx, command, timestamps=False, as_file=False)
+
     @commands.command("csx")
     @predicates.dev_only()
     async def csx_command(self, ctx: commands.Context, *, command: str):
-        logger = logging.getLogger("discord.dev_command")
-        logger.setLevel(logging.INFO)
-        log_stream = io.StringIO()
-        handler = logging.StreamHandler(log_stream)
-        
-        formatter = logging.Formatter("%(asctime)s [%(levelname)-8s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
-        handler.setFormatter(formatter)
-        
-        logger.addHandler(handler)
-
-        async with ctx.typing():
-            console = register_commands()
-            await console.execute_command(self.bot, command)
-
-            log_contents = log_stream.getvalue() or "No output"
-            content = f"```{log_contents}```"
-            
-            if len(content) > 2000:
-                await ctx.message.reply(file=discord.File(io.StringIO(log_contents), filename="log.txt"), mention_author=False)
-            else:
-                await ctx.message.reply(content, mention_author=False)
+        await self.run_console(ctx, command, timestamps=True, as_file=False)
     
     @commands.command("csf")
     @predicates.dev_only()
     async def csf_command(self, ctx: commands.Context, *, command: str):
-        logger = logging.getLogger("discord.dev_command")
-        logger.setLevel(logging.INFO)
-        log_stream = io.StringIO()
-        handler = logging.StreamHandler(log_stream)
-        logger.addHandler(handler)
-
-        async with ctx.typing():
-            console = register_commands()
-            await console.execute_command(self.bot, command)
-
-            log_contents = log_stream.getvalue() or None
-            
-            if log_contents is None:
-                await ctx.send("No output")
-                return
-            
-            await ctx.message.reply(file=discord.File(io.StringIO(log_contents), filename="log.txt"), mention_author=False)
+        await self.run_console(ctx, command, timestamps=False, as_file=True)
 
     @commands.command("csfx")
     @predicates.dev_only()
     async def csfx_command(self, ctx: commands.Context, *, command: str):
-        logger = logging.getLogger("discord.dev_command")
-        logger.setLevel(logging.INFO)
-        log_stream = io.StringIO()
-        handler = logging.StreamHandler(log_stream)
-        
-        formatter = logging.Formatter("%(asctime)s [%(levelname)-8s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
-        handler.setFormatter(formatter)
-        
-        logger.addHandler(handler)
-
-        async with ctx.typing():
-            console = register_commands()
-            await console.execute_command(self.bot, command)
-
-            log_contents = log_stream.getvalue() or None
-            
-            if log_contents is None:
-                await ctx.send("No output")
-                return
-
-            await ctx.message.reply(file=discord.File(io.StringIO(log_contents), filename="log.txt"), mention_author=False)
+        await self.run_console(ctx, command, timestamps=True, as_file=True)
 
 
 async def setup(bot: KurdDX):
@@ -1,29 +1,121 @@
 from __future__ import annotations
 
-import traceback
 import logging
+import time
 import sys
 
+import discord
 from discord.ext import commands
 
+from utils import local_file
 from utils.config import Config
+from utils.capabilities import capabilities
+from utils.error_handler import ErrorHandlerRegistry
+from utils.reply_coalescer import ReplyCoalescer
+from utils.log_pipeline import LogPipeline
+from utils.invite_cache import InviteCache
+from utils.member_index import MemberIndex
+from utils.guild_stats import GuildStats
+from utils.member_chunker import MemberChunker
+from utils.tree_sync import TreeSyncer
+from utils.extension_loader import load_extensions
+from utils.cache_profile import CacheProfile, FEATURES, get_profile, unsupported_features
 from utils.common import *
-from console.register_commands import register_commands
+from utils.common import extension_manifest, run_in_async
+from console.register_commands import get_console
+from constants import *
 
 
 class KurdDX(commands.Bot):
     config: Config
+    cache_profile: CacheProfile
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         self.logger = logging.getLogger("KurdDX.bot")
+        self.error_handlers = ErrorHandlerRegistry()
+        self.reply_coalescer = ReplyCoalescer()
+        self.log_pipeline: LogPipeline | None = None
+        self.invite_cache = InviteCache()
+        self.member_index = MemberIndex()
+        self.stats = GuildStats()
+        self.cache_profile = get_profile("full")
+        self.member_chunker = MemberChunker()
+        self.tree_syncer = TreeSyncer(TREE_SYNC_FILE)
+        # Only one cluster worker needs to sync the command tree at startup
+        self.sync_tree_at_startup = True
+        self.extension_load_times: dict[str, float] = {}
+        # Cluster workers have no stdin; the supervisor forwards console commands instead
+        self.interactive_console = True
+        self._degraded_features: set[str] = set()
 
     async def setup_hook(self):
-        self.loop.create_task(self.dev_console())
+        if self.config.get("log_queue", False):
+            self.log_pipeline = LogPipeline(
+                capacity=self.config.get("log_queue_capacity", 10000),
+                overflow=self.config.get("log_queue_overflow", "drop_debug_first"),
+            )
+            self.log_pipeline.install("", "discord")
+
+        self.logger.info("Using cache profile '%s'", self.cache_profile.name)
+        for feature, missing in unsupported_features(self.cache_profile).items():
+            self.logger.warning("'%s' is limited without the %s cache", feature, ", ".join(missing))
+
+        self.member_chunker.evict = not self.cache_profile.member_cache_flags.joined
+        self.member_chunker.idle_timeout = self.config.get("member_cache_idle_timeout", 600)
+
+        local_file.assets.reuse_urls = self.config.get("reuse_asset_urls", False)
+        self.reply_coalescer.window = self.config.get("error_coalesce_window", 5)
+        self.reply_coalescer.channel_burst = self.config.get("error_channel_burst", 5)
+
+        try:
+            count = await run_in_async(local_file.assets.preload, IMAGE_DIR)
+        except OSError as e:
+            self.logger.warning("Failed to preload assets: %s", e)
+        else:
+            self.logger.info("Preloaded %d assets", count)
+
+        await self.load_all_extensions()
+
+        if self.sync_tree_at_startup:
+            # A failed sync must not keep the bot from logging in; 'sync' can retry it
+            try:
+                await self.tree_syncer.sync(self)
+            except discord.HTTPException as e:
+                self.logger.error("Failed to sync command tree: %s", e)
+
+        if self.interactive_console:
+            self.loop.create_task(self.dev_console())
+        self.loop.create_task(self.probe_capabilities())
+
+    def feature_available(self, feature: str) -> bool:
+        """
+        Returns whether the active cache profile provides everything `feature` declared it needs.
+
+        A warning is logged the first time an unavailable feature is used.
+        """
+        available = all(self.cache_profile.supports(need) for need in FEATURES.get(feature, ()))
+        if not available and feature not in self._degraded_features:
+            self._degraded_features.add(feature)
+            self.logger.warning("'%s' is unavailable with cache profile '%s'", feature, self.cache_profile.name)
+        return available
+
+    def shard_latencies(self) -> list[tuple[int, float]]:
+        """
+        Returns (shard ID, latency in seconds) for every shard this process runs.
+        """
+        return [(self.shard_id or 0, self.latency)]
+
+    async def probe_capabilities(self):
+        for capability in await capabilities.probe_all():
+            if capability.available:
+                self.logger.info("Found %s: %s", capability.name, capability.version)
+            else:
+                self.logger.warning("%s is not available", capability.name)
     
     async def dev_console(self):
-        console = register_commands()
+        console = get_console()
 
         while True:
             command = await asyncio.get_event_loop().run_in_executor(None, input)
@@ -39,24 +131,42 @@ class KurdDX(commands.Bot):
             except Exception as e:
                 self.logger.error(f"Command execution failed: {e}")
 
-    async def on_ready(self):
-        self.logger.info("Logged in as %s", self.user)
+    async def close(self):
+        config = getattr(self, "config", None)
+        if config is not None:
+            await config.aflush()
 
-        await self.load_all_extensions()
+        await super().close()
 
-        await self.tree.sync()
+        if self.log_pipeline is not None:
+            self.log_pipeline.stop()
+
+    async def on_ready(self):
+        self.logger.info("Logged in as %s", self.user)
 
     async def load_all_extensions(self):
-        for path in get_extension():
-            if path in self.extensions:
-                continue
-            try:
-                await self.load_extension(path)
-            except Exception as e:
-                tb = traceback.format_exc()
-                self.logger.error(f"Failed to load extension {path}: {e}\n{tb}")
-            else:
-                self.logger.info(f"Loaded extension {path}")
+        manifest = await run_in_async(extension_manifest.scan)
+        dependencies = {path: depends for path, depends in manifest.items() if path not in self.extensions}
+        paths = list(dependencies)
+
+        start = time.perf_counter()
+        times = await load_extensions(self, dependencies)
+        self.extension_load_times.update(times)
+        if paths:
+            self.logger.info("Loaded %d/%d extensions in %.1f ms", len(times), len(paths), (time.perf_counter() - start) * 1000)
         
         if not self.extensions:
             self.logger.warning("No extensions loaded")
+
+
+class ShardedKurdDX(KurdDX, commands.AutoShardedBot):
+    """
+    KurdDX running one gateway connection per shard.
+
+    Enabled with "sharded" in `config.json`. "shard_count" and "shard_ids" are
+    passed to `AutoShardedBot`; when they are omitted Discord's recommended
+    shard count is used and every shard runs in this process.
+    """
+
+    def shard_latencies(self) -> list[tuple[int, float]]:
+        return self.latencies
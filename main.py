@@ -4,15 +4,65 @@ import os
 import discord
 
 from utils.config import Config
+from utils.cache_profile import get_profile
 from utils.exceptions import *
-from kurd_dx import KurdDX
+from kurd_dx import KurdDX, ShardedKurdDX
+from cluster import Supervisor
 from constants import *
 
 
+def configure(config: Config):
+    """
+    Applies the settings in `config.json` that control how the config itself is saved.
+    """
+    config.write_behind = config.get("config_write_behind", False)
+    config.flush_delay = config.get("config_flush_delay", 1.0)
+
+
+def create_bot(config: Config, **shard_kwargs) -> KurdDX:
+    """
+    Builds the bot from `config.json`. Raises ValueError for an unknown cache profile.
+    """
+    configure(config)
+
+    cache_profile = get_profile(config.get("cache_profile", "full"))
+
+    if config.get("lazy_chunking", False):
+        cache_profile.chunk_guilds_at_startup = False
+    
+    bot_class = KurdDX
+    if config.get("sharded", False) or shard_kwargs:
+        bot_class = ShardedKurdDX
+        shard_kwargs.setdefault("shard_count", config.get("shard_count"))
+        shard_kwargs.setdefault("shard_ids", config.get("shard_ids"))
+    
+    bot = bot_class(
+        command_prefix = config.get("command_prefix", "!"),
+        **cache_profile.client_kwargs(),
+        **shard_kwargs,
+    )
+
+    bot.config = config
+    bot.cache_profile = cache_profile
+
+    return bot
+
+
+def create_worker_bot(shard_ids: list[int], shard_count: int) -> KurdDX:
+    config = Config.shared(CONFIG_FILE)
+    config.load()
+
+    bot = create_bot(config, shard_ids=shard_ids, shard_count=shard_count)
+    bot.interactive_console = False
+    bot.sync_tree_at_startup = 0 in shard_ids
+
+    return bot
+
+
 def main():
     logger = logging.getLogger("KurdDX.main")
     
-    config = Config(CONFIG_FILE)
+    config = Config.shared(CONFIG_FILE)
     try:
         config.load()
     except FileNotFoundError as e:
@@ -31,16 +81,37 @@ def main():
         filename = os.path.basename(token_config.path)
         raise TokenNotFoundError(f"Token not found in '{filename}'")
 
-    intents = discord.Intents.all()
-    
-    bot = KurdDX(
-        command_prefix = config.get("command_prefix", "!"),
-        intents = intents,
-    )
+    workers = config.get("cluster_workers", 0)
+    if workers > 1:
+        shard_count = config.get("shard_count")
+        if shard_count is None:
+            logger.error("'shard_count' is required when 'cluster_workers' is set")
+            return
 
-    bot.config = config
+        try:
+            get_profile(config.get("cache_profile", "full"))
+        except ValueError as e:
+            logger.error(str(e))
+            return
+
+        discord.utils.setup_logging(root=True)
+        supervisor = Supervisor(
+            token,
+            shard_count,
+            workers,
+            create_worker_bot,
+            timeout=config.get("cluster_command_timeout", 60),
+        )
+        supervisor.run()
+        return
+
+    try:
+        bot = create_bot(config)
+    except ValueError as e:
+        logger.error(str(e))
+        return
 
-    bot.run(token_config.get("token"), root_logger=True)
+    bot.run(token, root_logger=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from kurd_dx import ShardedKurdDX
+
+
+class StubGatewayBot(ShardedKurdDX):
+    """
+    A sharded bot that never connects to Discord.
+
+    Each shard has one fake guild with 10 members (2 bots), so console
+    commands have something to report and the cluster merge can be checked.
+    """
+
+    def __init__(self, shard_ids: list[int], shard_count: int):
+        super().__init__(
+            command_prefix="!",
+            intents=discord.Intents.none(),
+            shard_ids=shard_ids,
+            shard_count=shard_count,
+        )
+        self._fake_guilds = [
+            SimpleNamespace(
+                id=1000 + shard_id,
+                name=f"Guild {shard_id}",
+                shard_id=shard_id,
+                member_count=10,
+                members=[SimpleNamespace(bot=i < 2) for i in range(10)],
+                channels=[None] * 3,
+                roles=[None] * 2,
+            )
+            for shard_id in shard_ids
+        ]
+        self.stats.rebuild(self._fake_guilds)
+        self._stopped: asyncio.Event | None = None
+
+    @property
+    def guilds(self):
+        return self._fake_guilds
+
+    def shard_latencies(self) -> list[tuple[int, float]]:
+        return [(shard_id, 0.05) for shard_id in self.shard_ids]
+
+    async def start(self, token: str, *, reconnect: bool = True):
+        self._stopped = asyncio.Event()
+        await self._stopped.wait()
+
+    async def close(self):
+        if self._stopped is not None:
+            self._stopped.set()
+
+    def is_closed(self) -> bool:
+        return self._stopped is not None and self._stopped.is_set()
+
+
+def create_stub_bot(shard_ids: list[int], shard_count: int) -> StubGatewayBot:
+    return StubGatewayBot(shard_ids, shard_count)
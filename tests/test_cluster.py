@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+import main
+from cluster import Supervisor, shard_ranges
+from tests.cluster_stubs import create_stub_bot
+
+
+def test_shard_ranges():
+    assert shard_ranges(10, 3) == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert shard_ranges(2, 4) == [[0], [1]]
+
+
+@pytest.fixture
+def supervisor():
+    supervisor = Supervisor("token", shard_count=4, workers=2, factory=create_stub_bot, timeout=30)
+    supervisor.start()
+    yield supervisor
+    supervisor.stop()
+    assert all(worker.process.exitcode == 0 for worker in supervisor.workers)
+
+
+def test_servers_merged_across_workers(supervisor):
+    results = supervisor.execute("servers")
+
+    assert [result.worker.shard_ids for result in results] == [[0, 1], [2, 3]]
+    assert all(result.code == 0 for result in results)
+
+    merged = supervisor.merge("servers", results)
+    assert merged[0] == "Bot is in 4 servers"
+    assert merged[1] == "- Members: 40 (32 humans, 8 bots)"
+    assert merged[-4:] == [f"- Shard {i}: 1 servers, 50 ms" for i in range(4)]
+
+
+def test_server_list_merged_across_workers(supervisor):
+    results = supervisor.execute("server list")
+
+    merged = supervisor.merge("server list", results)
+    assert merged[0] == "Server list:"
+    assert [line for line in merged if line.startswith("- ")] == [f"- Guild {i} ({1000 + i})" for i in range(4)]
+
+
+def test_unmergeable_command_is_not_merged(supervisor):
+    results = supervisor.execute("no such command")
+
+    assert all(result.code is None for result in results)
+    assert all("not found" in result.output for result in results)
+    assert supervisor.merge("no such command", results) is None
+
+
+def test_worker_bot_applies_config_settings(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"config_write_behind": True, "config_flush_delay": 3}))
+    monkeypatch.setattr(main, "CONFIG_FILE", str(path))
+
+    bot = main.create_worker_bot([0, 1], 4)
+    try:
+        assert bot.config.write_behind and bot.config.flush_delay == 3
+        assert bot.shard_ids == [0, 1] and bot.sync_tree_at_startup
+    finally:
+        bot.config.close()
@@ -0,0 +1,69 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from utils.config import Config
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"prefix": "!"}))
+    return str(path)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="file modes are POSIX-only")
+def test_save_keeps_file_mode(config_path):
+    os.chmod(config_path, 0o644)
+    config = Config(config_path).load()
+
+    config.set("prefix", "?")
+
+    assert os.stat(config_path).st_mode & 0o777 == 0o644
+    assert json.load(open(config_path)) == {"prefix": "?"}
+
+
+def test_set_not_blocked_by_flush(config_path):
+    config = Config(config_path, write_behind=True, flush_delay=60).load()
+    writing = threading.Event()
+    release = threading.Event()
+    write = config._write
+
+    def slow_write(content):
+        writing.set()
+        release.wait(5)
+        write(content)
+
+    config._write = slow_write
+    config.set("prefix", "?")
+    flusher = threading.Thread(target=config.flush)
+    flusher.start()
+    assert writing.wait(5)
+
+    start = time.monotonic()
+    config.set("prefix", "$")
+    assert time.monotonic() - start < 1
+
+    release.set()
+    flusher.join()
+    assert config._dirty
+
+    config._write = write
+    config.flush()
+    assert json.load(open(config_path)) == {"prefix": "$"}
+    assert not config._dirty
+
+
+def test_shared_instance_reused_and_closed(config_path):
+    config = Config.shared(config_path, write_behind=True, flush_delay=60)
+    assert Config.shared(config_path) is config
+
+    config.load().set("prefix", "?")
+    config.close()
+
+    assert json.load(open(config_path)) == {"prefix": "?"}
+    assert Config.shared(config_path) is not config
+    Config.shared(config_path).close()
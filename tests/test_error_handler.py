@@ -0,0 +1,54 @@
+from discord.ext import commands
+
+from utils.error_handler import ErrorHandlerRegistry, error_handler
+
+
+class BaseHandlers:
+    @error_handler(commands.CommandOnCooldown)
+    async def on_cooldown(self, ctx, error):
+        pass
+
+
+class OverridingHandlers:
+    @error_handler(commands.CommandOnCooldown)
+    async def on_cooldown(self, ctx, error):
+        pass
+
+
+def test_override_restored_after_unload():
+    registry = ErrorHandlerRegistry()
+    base = BaseHandlers()
+    override = OverridingHandlers()
+
+    registry.register_object(base)
+    registry.register_object(override)
+    assert registry.resolve(commands.CommandOnCooldown) == override.on_cooldown
+
+    registry.unregister_object(override)
+    assert registry.resolve(commands.CommandOnCooldown) == base.on_cooldown
+
+    registry.unregister_object(base)
+    assert registry.resolve(commands.CommandOnCooldown) is None
+
+
+def test_unloading_overridden_owner_keeps_override():
+    registry = ErrorHandlerRegistry()
+    base = BaseHandlers()
+    override = OverridingHandlers()
+
+    registry.register_object(base)
+    registry.register_object(override)
+    registry.unregister_object(base)
+
+    assert registry.resolve(commands.CommandOnCooldown) == override.on_cooldown
+
+
+def test_resolves_most_specific_base():
+    registry = ErrorHandlerRegistry()
+    base = BaseHandlers()
+
+    registry.register_object(base)
+    registry.register(commands.CommandError, override := OverridingHandlers().on_cooldown)
+
+    assert registry.resolve(commands.CommandOnCooldown) == base.on_cooldown
+    assert registry.resolve(commands.CommandNotFound) == override
@@ -0,0 +1,52 @@
+import asyncio
+
+from utils.extension_loader import load_extensions
+
+
+class StubBot:
+    """Records load and reload calls; extensions whose name ends in "slow" take longer."""
+
+    def __init__(self, loaded=()):
+        self.extensions = {name: object() for name in loaded}
+        self.calls: list[tuple[str, str]] = []
+
+    async def _run(self, action: str, name: str):
+        await asyncio.sleep(0.02 if name.endswith("slow") else 0)
+        if name.startswith("broken"):
+            raise RuntimeError("broken")
+        self.extensions[name] = object()
+        self.calls.append((action, name))
+
+    async def load_extension(self, name: str):
+        await self._run("load", name)
+
+    async def reload_extension(self, name: str):
+        await self._run("reload", name)
+
+
+def test_reload_follows_dependency_order():
+    bot = StubBot(loaded=("base_slow", "feature"))
+    dependencies = {"feature": ("base_slow",), "base_slow": (), "extra": ("feature",)}
+
+    times = asyncio.run(load_extensions(bot, dependencies, reload=True))
+
+    assert bot.calls == [("reload", "base_slow"), ("reload", "feature"), ("load", "extra")]
+    assert set(times) == set(dependencies)
+
+
+def test_load_skips_loaded_extensions():
+    bot = StubBot(loaded=("base",))
+
+    times = asyncio.run(load_extensions(bot, {"base": (), "feature": ("base",)}))
+
+    assert bot.calls == [("load", "feature")]
+    assert set(times) == {"feature"}
+
+
+def test_failed_and_cyclic_dependencies_skip_dependents():
+    bot = StubBot()
+    dependencies = {"broken": (), "feature": ("broken",), "a": ("b",), "b": ("a",), "standalone": ()}
+
+    times = asyncio.run(load_extensions(bot, dependencies))
+
+    assert set(times) == {"standalone"}
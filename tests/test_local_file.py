@@ -0,0 +1,247 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import aiohttp.web
+import discord
+import pytest
+
+from utils import local_file
+from utils.embed_template import EmbedTemplate
+from utils.local_file import AssetRegistry
+
+
+CDN_URL = "https://cdn.discordapp.com/attachments/1/2/error.png?ex={ex:x}&is=0&hm=0"
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def sent_message(url: str, message_id: int = 10, channel_id: int = 20, in_embed: bool = True):
+    """A stand-in for the discord.Message returned when an error embed is sent."""
+    embed = SimpleNamespace(
+        thumbnail=SimpleNamespace(url=url if in_embed else None),
+        image=SimpleNamespace(url=None),
+    )
+    attachments = [] if in_embed else [SimpleNamespace(url=url, filename="error.png")]
+    return SimpleNamespace(id=message_id, channel=SimpleNamespace(id=channel_id), embeds=[embed], attachments=attachments)
+
+
+@pytest.fixture
+def asset(tmp_path):
+    path = tmp_path / "error.png"
+    path.write_bytes(b"png")
+    return str(path)
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def registry(clock):
+    registry = AssetRegistry(clock=clock)
+    registry.reuse_urls = True
+    return registry
+
+
+def upload(registry, asset, clock, **kwargs):
+    url, file = registry.resolve(asset)
+    assert url == "attachment://error.png" and file is not None
+    cdn_url = CDN_URL.format(ex=int(clock.now) + 86400)
+    registry.record_upload(sent_message(cdn_url, **kwargs), file)
+    return cdn_url
+
+
+def test_reuses_url_from_embed_thumbnail(registry, asset, clock):
+    cdn_url = upload(registry, asset, clock)
+
+    assert registry.resolve(asset) == (cdn_url, None)
+
+
+def test_reuses_url_from_attachments(registry, asset, clock):
+    cdn_url = upload(registry, asset, clock, in_embed=False)
+
+    assert registry.resolve(asset) == (cdn_url, None)
+
+
+def test_reupload_after_expiry(registry, asset, clock):
+    upload(registry, asset, clock)
+
+    clock.now += 86400 - AssetRegistry.URL_EXPIRY_MARGIN
+    url, file = registry.resolve(asset)
+    assert url == "attachment://error.png" and file is not None
+
+
+def test_reupload_after_origin_message_deleted(registry, asset, clock):
+    upload(registry, asset, clock, message_id=10)
+
+    registry.forget_message(11)
+    assert registry.resolve(asset)[1] is None
+
+    registry.forget_message(10)
+    url, file = registry.resolve(asset)
+    assert url == "attachment://error.png" and file is not None
+
+
+def test_reupload_after_origin_channel_deleted(registry, asset, clock):
+    upload(registry, asset, clock, channel_id=20)
+
+    registry.forget_channel(20)
+    url, file = registry.resolve(asset)
+    assert url == "attachment://error.png" and file is not None
+
+
+def test_unsent_upload_not_matched_to_other_asset(registry, asset, clock, tmp_path):
+    other = tmp_path / "other" / "error.png"
+    other.parent.mkdir()
+    other.write_bytes(b"other png")
+
+    registry.resolve(asset)  # The send for this one was dropped
+    cdn_url = CDN_URL.format(ex=int(clock.now) + 86400)
+    _, file = registry.resolve(str(other))
+    registry.record_upload(sent_message(cdn_url), file)
+
+    assert registry.resolve(str(other)) == (cdn_url, None)
+    assert registry.resolve(asset)[1] is not None
+
+
+def test_disabled_reuse_always_uploads(registry, asset, clock):
+    upload(registry, asset, clock)
+    registry.reuse_urls = False
+
+    url, file = registry.resolve(asset)
+    assert url == "attachment://error.png" and file is not None
+
+
+def json_response(data: dict, status: int = 200) -> aiohttp.web.Response:
+    # discord.py only decodes bodies whose content type is exactly application/json
+    return aiohttp.web.Response(body=json.dumps(data).encode(), status=status, content_type="application/json")
+
+
+class DiscordStandIn:
+    """A local HTTP server answering the Discord API routes a reply uses."""
+
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self.requests: list[dict] = []
+        self.fail = False
+        self.base = None
+        self._runner = None
+
+    async def start(self):
+        app = aiohttp.web.Application()
+        app.router.add_get("/api/v10/users/@me", self.me)
+        app.router.add_post("/api/v10/channels/{channel_id}/messages", self.create_message)
+        self._runner = aiohttp.web.AppRunner(app)
+        await self._runner.setup()
+        site = aiohttp.web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base = f"http://127.0.0.1:{port}/api/v10"
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+    def user(self) -> dict:
+        return {"id": "1", "username": "KurdDX", "discriminator": "0", "avatar": None, "bot": True}
+
+    async def me(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
+        return json_response(self.user())
+
+    async def create_message(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
+        channel_id = request.match_info["channel_id"]
+        payload, files = {}, {}
+        if request.content_type.startswith("multipart/"):
+            async for part in await request.multipart():
+                if part.name == "payload_json":
+                    payload = json.loads(await part.text())
+                else:
+                    files[part.filename] = await part.read()
+        else:
+            payload = await request.json()
+        self.requests.append({"payload": payload, "files": files})
+
+        if self.fail:
+            return json_response({"code": 50035, "message": "Invalid Form Body"}, status=400)
+
+        message_id = str(100 + len(self.requests))
+        ex = int(self.clock.now) + 86400
+        urls = {
+            name: f"https://cdn.discordapp.com/attachments/{channel_id}/{message_id}/{name}?ex={ex:x}&is=0&hm=0"
+            for name in files
+        }
+        embeds = payload.get("embeds", [])
+        for embed in embeds:
+            thumbnail = embed.get("thumbnail", {}).get("url", "")
+            if thumbnail.startswith("attachment://"):
+                embed["thumbnail"]["url"] = urls[thumbnail[len("attachment://"):]]
+
+        return json_response({
+            "id": message_id,
+            "channel_id": channel_id,
+            "author": self.user(),
+            "content": "",
+            "timestamp": "2026-10-18T00:00:00+00:00",
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [
+                {"id": str(i), "filename": name, "size": len(data), "url": urls[name], "proxy_url": urls[name]}
+                for i, (name, data) in enumerate(files.items())
+            ],
+            "embeds": embeds,
+            "pinned": False,
+            "type": 0,
+        })
+
+
+def test_send_path_reuses_uploaded_url(registry, asset, clock, monkeypatch):
+    template = EmbedTemplate("Error", thumbnail=asset)
+    monkeypatch.setattr(local_file, "assets", registry)
+
+    async def run(server: DiscordStandIn):
+        await server.start()
+        monkeypatch.setattr(discord.http.Route, "BASE", server.base)
+        client = discord.Client(intents=discord.Intents.none())
+        await client._async_setup_hook()
+        await client.http.static_login("token")
+        channel = client.get_partial_messageable(20)
+
+        async def reply(description: str) -> discord.Message | None:
+            embed, file = template.render(description)
+            try:
+                message = await channel.send(embed=embed, file=file)
+            except discord.HTTPException:
+                return None
+            local_file.assets.record_upload(message, file)
+            return message
+
+        try:
+            server.fail = True
+            assert await reply("failed") is None
+            server.fail = False
+            first = await reply("first")
+            await reply("second")
+        finally:
+            await client.close()
+            await server.stop()
+        return first
+
+    server = DiscordStandIn(clock)
+    first = asyncio.run(run(server))
+
+    failed, uploaded, reused = server.requests
+    assert list(failed["files"]) == ["error.png"]
+    assert list(uploaded["files"]) == ["error.png"] and uploaded["files"]["error.png"] == b"png"
+    assert reused["files"] == {}
+    assert reused["payload"]["embeds"][0]["thumbnail"]["url"] == first.embeds[0].thumbnail.url
+    assert first.embeds[0].thumbnail.url.startswith("https://cdn.discordapp.com/attachments/20/")
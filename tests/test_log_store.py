@@ -0,0 +1,63 @@
+import asyncio
+import datetime
+import logging
+
+from console.capture import capture_output
+from console.command import log_store
+from console.log_store import LogStore
+from console.register_commands import get_console
+
+
+def messages(entries) -> list[str]:
+    return [entry.message for entry in entries]
+
+
+def test_time_range_in_order():
+    store = LogStore(capacity=4)
+    for t in range(6):
+        store.append(100 + t, logging.INFO, "INFO", "discord", f"m{t}")
+
+    assert messages(store.query(since=103, until=105)) == ["m3", "m4"]
+    assert messages(store.query(since=103, until=105, level=logging.INFO)) == ["m3", "m4"]
+
+
+def test_time_range_with_out_of_order_record():
+    store = LogStore()
+    store.append(100, logging.INFO, "INFO", "discord", "a")
+    store.append(110, logging.INFO, "INFO", "discord", "b")
+    store.append(105, logging.INFO, "INFO", "discord.gateway", "late")
+    store.append(120, logging.INFO, "INFO", "discord", "c")
+
+    assert messages(store.query(since=104, until=111)) == ["b", "late"]
+    assert messages(store.query(since=101)) == ["b", "late", "c"]
+    assert messages(store.query(until=106)) == ["a", "late"]
+
+
+def test_out_of_order_record_evicted():
+    store = LogStore(capacity=2)
+    store.append(110, logging.INFO, "INFO", "discord", "a")
+    store.append(100, logging.INFO, "INFO", "discord", "late")
+    store.append(120, logging.INFO, "INFO", "discord", "b")
+    store.append(130, logging.INFO, "INFO", "discord", "c")
+
+    assert messages(store.query(since=125)) == ["c"]
+
+
+def test_export_log_absolute_range():
+    log_store.clear()
+    base = datetime.datetime(2026, 10, 18, 9, 0).timestamp()
+    for minute in range(4):
+        log_store.append(base + minute * 60, logging.INFO, "INFO", "discord", f"at {minute}")
+
+    async def run(command: str):
+        with capture_output() as capture:
+            code = await get_console().execute_command(None, command)
+        return code, capture.getvalue()
+
+    code, output = asyncio.run(run("export log --logger_name=discord --since=2026-10-18T09:01 --until=2026-10-18T09:03"))
+    assert code == 0
+    assert [line.rsplit("] ", 1)[1] for line in output.splitlines()] == ["at 1", "at 2"]
+
+    code, output = asyncio.run(run("export log --since=yesterday"))
+    assert code == 1 and "Invalid time" in output
+    log_store.clear()
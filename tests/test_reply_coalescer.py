@@ -0,0 +1,79 @@
+import asyncio
+
+import discord
+
+from utils.reply_coalescer import ReplyCoalescer
+
+
+class Clock:
+    def __init__(self, now: float = 1_000):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Message:
+    """A stand-in for the discord.Message a reply was sent as."""
+
+    def __init__(self, embed: discord.Embed):
+        self.embeds = [embed]
+        self.edits: list[discord.Embed] = []
+
+    async def edit(self, embed: discord.Embed):
+        self.edits.append(embed)
+        self.embeds = [embed]
+
+
+class Channel:
+    def __init__(self):
+        self.messages: list[Message] = []
+
+    def sender(self, embed: discord.Embed):
+        async def send() -> Message:
+            message = Message(embed)
+            self.messages.append(message)
+            return message
+        return send
+
+
+def reply(coalescer: ReplyCoalescer, channel: Channel, title: str, description: str, **kwargs):
+    embed = discord.Embed(title=title, description=description)
+    return coalescer.send(1, 2, embed, channel.sender(embed), "command", **kwargs)
+
+
+def test_different_descriptions_both_sent():
+    async def run():
+        coalescer = ReplyCoalescer(window=5, clock=Clock())
+        channel = Channel()
+
+        await reply(coalescer, channel, "Missing Required Argument", "`user` is a required argument")
+        await reply(coalescer, channel, "Missing Required Argument", "`reason` is a required argument")
+        return coalescer, channel
+
+    coalescer, channel = asyncio.run(run())
+    assert [m.embeds[0].description for m in channel.messages] == [
+        "`user` is a required argument",
+        "`reason` is a required argument",
+    ]
+    assert coalescer.sent == 2 and coalescer.suppressed == 0
+
+
+def test_repeats_summarized_with_latest_description():
+    async def run():
+        clock = Clock()
+        coalescer = ReplyCoalescer(window=0.01, clock=clock)
+        channel = Channel()
+
+        for remaining in (3, 2, 1):
+            await reply(coalescer, channel, "Command is on cooldown", f"Please try again in `{remaining} seconds`", detail="cooldown")
+        clock.now += 1
+        await asyncio.sleep(0.05)
+        return coalescer, channel
+
+    coalescer, channel = asyncio.run(run())
+    assert len(channel.messages) == 1 and coalescer.suppressed == 2
+
+    edited = channel.messages[0].edits[-1]
+    assert edited.description == "Please try again in `1 seconds`"
+    assert edited.footer.text == "Repeated 3 times"
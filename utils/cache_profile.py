@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import discord
+
+
+class CacheProfile:
+    """
+    A named set of gateway intents and cache settings.
+
+    Parameters
+    ----------
+    name : str
+        The name used in `config.json` ("cache_profile").
+    intents : discord.Intents
+        The gateway intents.
+    member_cache_flags : discord.MemberCacheFlags
+        Which members are kept in the cache.
+    max_messages : int | None
+        The size of the message cache. None disables it.
+    chunk_guilds_at_startup : bool
+        Whether every guild's member list is requested at login.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        intents: discord.Intents,
+        member_cache_flags: discord.MemberCacheFlags,
+        max_messages: int | None,
+        chunk_guilds_at_startup: bool,
+    ):
+        self.name = name
+        self.intents = intents
+        self.member_cache_flags = member_cache_flags
+        self.max_messages = max_messages
+        self.chunk_guilds_at_startup = chunk_guilds_at_startup
+
+    def client_kwargs(self) -> dict[str, Any]:
+        return {
+            "intents": self.intents,
+            "member_cache_flags": self.member_cache_flags,
+            "max_messages": self.max_messages,
+            "chunk_guilds_at_startup": self.chunk_guilds_at_startup,
+        }
+
+    def supports(self, need: str) -> bool:
+        if need == "members":
+            # Guilds are chunked on demand when members are not cached up front
+            return self.intents.members
+        if need == "presences":
+            return self.intents.presences
+        if need == "messages":
+            return self.max_messages is not None
+        raise ValueError(f"Unknown cache need '{need}'")
+
+
+def _full() -> CacheProfile:
+    intents = discord.Intents.all()
+    return CacheProfile(
+        "full",
+        intents,
+        discord.MemberCacheFlags.from_intents(intents),
+        max_messages=1000,
+        chunk_guilds_at_startup=True,
+    )
+
+
+def _lean() -> CacheProfile:
+    intents = discord.Intents.default()
+    intents.members = True
+    intents.message_content = True
+    return CacheProfile(
+        "lean",
+        intents,
+        discord.MemberCacheFlags.none(),
+        max_messages=None,
+        chunk_guilds_at_startup=False,
+    )
+
+
+def _stateless() -> CacheProfile:
+    intents = discord.Intents.default()
+    intents.message_content = True
+    return CacheProfile(
+        "stateless",
+        intents,
+        discord.MemberCacheFlags.none(),
+        max_messages=None,
+        chunk_guilds_at_startup=False,
+    )
+
+
+PROFILES: dict[str, Callable[[], CacheProfile]] = {
+    "full": _full,
+    "lean": _lean,
+    "stateless": _stateless,
+}
+
+# Features that only work fully with certain caches, by name, with their needs
+FEATURES: dict[str, tuple[str, ...]] = {}
+
+
+def get_profile(name: str) -> CacheProfile:
+    try:
+        return PROFILES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown cache profile '{name}'. Available: {', '.join(PROFILES)}") from None
+
+
+def declare_feature(feature: str, *needs: str):
+    """
+    Records that `feature` needs the given caches ("members", "presences", "messages").
+    """
+    FEATURES[feature] = needs
+
+
+def unsupported_features(profile: CacheProfile) -> dict[str, list[str]]:
+    return {
+        feature: missing
+        for feature, needs in FEATURES.items()
+        if (missing := [need for need in needs if not profile.supports(need)])
+    }
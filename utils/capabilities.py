@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import shutil
+
+
+logger = logging.getLogger("KurdDX.capabilities")
+
+
+class Capability:
+    def __init__(self, name: str, available: bool, version: str | None = None, path: str | None = None):
+        self.name = name
+        self.available = available
+        self.version = version
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"<Capability name={self.name!r} available={self.available} version={self.version!r}>"
+
+
+class CapabilityRegistry:
+    """
+    Probes external executables once and caches the result.
+
+    Probing runs the executable with its version arguments through
+    `asyncio.create_subprocess_exec`, so it never blocks the event loop.
+    """
+
+    def __init__(self, timeout: float = 10):
+        self.timeout = timeout
+        self._probes: dict[str, tuple[str, ...]] = {}
+        self._results: dict[str, Capability] = {}
+        self._pending: dict[str, asyncio.Task[Capability]] = {}
+
+    def register(self, name: str, *version_args: str):
+        self._probes[name] = version_args or ("-version",)
+
+    def names(self) -> list[str]:
+        return list(self._probes)
+
+    def get(self, name: str) -> Capability | None:
+        return self._results.get(name)
+
+    async def probe(self, name: str) -> Capability:
+        """
+        Probes `name` again, sharing the run with any probe already in flight.
+        """
+        if name not in self._probes:
+            raise KeyError(f"Capability '{name}' is not registered")
+
+        task = self._pending.get(name)
+        if task is None:
+            task = asyncio.create_task(self._probe(name, self._probes[name]))
+            self._pending[name] = task
+            task.add_done_callback(lambda _: self._pending.pop(name, None))
+        return await asyncio.shield(task)
+
+    async def probe_all(self) -> list[Capability]:
+        return list(await asyncio.gather(*(self.probe(name) for name in self._probes)))
+
+    async def ensure(self, name: str) -> Capability:
+        """
+        Returns the cached result for `name`, probing only if it was never probed.
+        """
+        capability = self._results.get(name)
+        if capability is None:
+            capability = await self.probe(name)
+        return capability
+
+    async def _probe(self, name: str, version_args: tuple[str, ...]) -> Capability:
+        path = shutil.which(name)
+        capability = Capability(name, False, path=path)
+
+        if path is not None:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    path, *version_args,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                stdout, _ = await asyncio.wait_for(process.communicate(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                # Reap the process so it does not linger as a zombie with an open transport
+                await process.wait()
+                logger.warning("Probing %s timed out", name)
+            except OSError as e:
+                logger.warning("Failed to probe %s: %s", name, e)
+            else:
+                if process.returncode == 0:
+                    capability.available = True
+                    lines = stdout.decode(errors="replace").splitlines()
+                    capability.version = lines[0].strip() if lines else None
+
+        self._results[name] = capability
+        return capability
+
+
+capabilities = CapabilityRegistry()
+capabilities.register("ffmpeg", "-version")
+capabilities.register("ffprobe", "-version")
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-import os
-import re
 import asyncio
 from typing import Generator, TypeVar, AsyncIterator, Callable, Any
 
 import discord
 
+from utils.extension_manifest import ExtensionManifest
+from constants import EXTENSION_DIR, EXTENSION_MANIFEST_FILE
+
 
 T = TypeVar("T")
 
+extension_manifest = ExtensionManifest(EXTENSION_DIR, EXTENSION_MANIFEST_FILE)
+
 
 async def run_in_async(func: Callable[..., T], *args: Any) -> T:
     """
@@ -117,24 +120,14 @@ def truncate(string: str, max_length: int, ellipsis: str | None = "...") -> str:
 
 def get_extension() -> Generator[str, None, None]:
     """
-    Yields the names of Python files from the 'extension' directory that define an async setup function.
+    Yields the module names of extensions under the 'extensions' directory (including
+    nested packages) that define an async setup function.
+
+    Only files added or changed since the last call are read; see `ExtensionManifest`.
 
     Yields
     ------
     str
-        The names of valid extension files containing async setup function.
+        The module names of valid extensions.
     """
-    EXTENSION_DIR = "extensions"
-    async_setup_pattern = re.compile(r'^\s*async\s+def\s+setup\s*\(', re.MULTILINE)
-
-    for path in os.listdir(EXTENSION_DIR):
-        if path.startswith("_") or not path.endswith(".py"):
-            continue
-
-        full_path = os.path.join(EXTENSION_DIR, path)
-
-        with open(full_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-            if async_setup_pattern.search(content):
-                name, _ = os.path.splitext(full_path)
-                yield name.replace(os.sep, os.extsep)
+    yield from extension_manifest.scan()
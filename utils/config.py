@@ -1,33 +1,265 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import json
 import os
-from typing import Any
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, ClassVar, Iterator, TypeVar
+
+
+T = TypeVar("T")
+
+# File I/O for the async API runs here instead of on the event loop thread.
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="KurdDX.config")
+
+# Mode for a newly created file; mkstemp creates temp files with 0600 regardless of the umask.
+_umask = os.umask(0)
+os.umask(_umask)
+_NEW_FILE_MODE = 0o666 & ~_umask
 
 
 class Config:
-    def __init__(self, path: str, indent: int = 4):
+    _shared: ClassVar[dict[str, Config]] = {}
+
+    def __init__(
+        self,
+        path: str,
+        indent: int = 4,
+        check_interval: float = 1.0,
+        write_behind: bool = False,
+        flush_delay: float = 1.0,
+    ):
         self.path = path
         self.indent = indent
+        self.check_interval = check_interval
+        self.write_behind = write_behind
+        self.flush_delay = flush_delay
         self.config: dict[str, Any] | None = None
+        self.revision = 0
+        self._stamp: tuple[int, int, int] | None = None
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+        # Serializes file writes; held without `_lock` so mutations are not blocked by disk I/O
+        self._save_lock = threading.Lock()
+        self._saved_revision = -1
+        self._dirty = False
+        self._batch_depth = 0
+        self._flush_timer: threading.Timer | None = None
+        self._derived: dict[str, tuple[int, Any]] = {}
+
+    @classmethod
+    def shared(cls, path: str, **kwargs: Any) -> Config:
+        """
+        Returns the process-wide instance for `path`, creating it on first use.
+
+        Shared instances flush pending write-behind changes at interpreter exit.
+        """
+        key = os.path.abspath(path)
+        config = cls._shared.get(key)
+        if config is None:
+            config = cls._shared[key] = cls(path, **kwargs)
+            atexit.register(config.flush)
+        return config
+
+    def close(self):
+        """
+        Flushes pending changes and, for a shared instance, stops flushing it at exit.
+        """
+        self.flush()
+        key = os.path.abspath(self.path)
+        if self._shared.get(key) is self:
+            del self._shared[key]
+            atexit.unregister(self.flush)
+
+    def cached(self, name: str, factory: Callable[[Config], T]) -> T:
+        """
+        Returns `factory(self)`, recomputed only when the config revision changes.
+        """
+        entry = self._derived.get(name)
+        if entry is not None and entry[0] == self.revision:
+            return entry[1]
+        value = factory(self)
+        self._derived[name] = (self.revision, value)
+        return value
 
-    def load(self) -> Config:
-        if not os.path.exists(self.path):
+    def _stat(self) -> tuple[int, int, int]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
             e = FileNotFoundError(f"Config file not found: {self.path}")
             e.filename = os.path.basename(self.path)
             e.filename2 = self.path
             raise e
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def load(self, force: bool = False) -> Config:
+        stamp = self._stat()
+        self._checked_at = time.monotonic()
+        if not force and self.config is not None and stamp == self._stamp:
+            return self
         with open(self.path, "r") as f:
             self.config = json.load(f)
+        self._stamp = stamp
+        self.revision += 1
         return self
 
+    def refresh(self) -> Config:
+        """
+        Reloads the file only if it changed on disk.
+
+        The file is stat'ed at most once per `check_interval` seconds, so calling
+        this on every command costs a clock read. If the file is missing or
+        mid-write, the last good copy is kept.
+        """
+        if self.config is None:
+            return self.load()
+        if self._dirty:
+            return self
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self
+        try:
+            return self.load()
+        except (FileNotFoundError, json.JSONDecodeError):
+            return self
+
     def save(self) -> Config:
+        """
+        Writes the config to disk atomically (temp file + fsync + rename).
+
+        The config is serialized under the lock and written outside it, so
+        `set` and `transaction` are not blocked while the file is flushed.
+        """
         if self.config is None:
             raise ValueError("Config is not loaded")
-        with open(self.path, "w") as f:
-            json.dump(self.config, f, indent=self.indent)
+        with self._lock:
+            self._cancel_flush()
+            revision = self.revision
+            content = json.dumps(self.config, indent=self.indent)
+
+        with self._save_lock:
+            # A newer snapshot was written while this one waited
+            if revision < self._saved_revision:
+                return self
+            self._write(content)
+            self._saved_revision = revision
+            with self._lock:
+                self._stamp = self._stat()
+                if self.revision == revision:
+                    self._dirty = False
         return self
 
+    def _write(self, content: str):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{os.path.basename(self.path)}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                mode = os.stat(self.path).st_mode & 0o777
+            except FileNotFoundError:
+                mode = _NEW_FILE_MODE
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        if os.name == "posix":
+            dir_fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def flush(self) -> Config:
+        """
+        Writes pending write-behind changes immediately, if there are any.
+        """
+        with self._lock:
+            self._cancel_flush()
+            if not self._dirty:
+                return self
+        return self.save()
+
+    @contextmanager
+    def transaction(self) -> Iterator[Config]:
+        """
+        Batches every mutation made inside the block into a single write.
+
+        Changes are applied in memory as they are made; there is no rollback.
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+            self._persist()
+
+    def _mark_dirty(self):
+        # Called with the lock held; the caller persists after releasing it
+        self.revision += 1
+        self._dirty = True
+
+    def _persist(self):
+        with self._lock:
+            if self._batch_depth > 0 or not self._dirty:
+                return
+            if self.write_behind:
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+                return
+        self.save()
+
+    def _cancel_flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+
+    async def aload(self, force: bool = False) -> Config:
+        return await self._run(self.load, force)
+
+    async def asave(self) -> Config:
+        return await self._run(self.save)
+
+    async def aflush(self) -> Config:
+        return await self._run(self.flush)
+
+    async def arefresh(self) -> Config:
+        if self.config is not None and (
+            self._dirty or time.monotonic() - self._checked_at < self.check_interval
+        ):
+            return self
+        return await self._run(self.refresh)
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        await self.arefresh()
+        return self.get(key, default)
+
+    async def aset(self, key: str, value: Any) -> Config:
+        return await self._run(self.set, key, value)
+
+    async def aremove(self, key: str) -> Config:
+        return await self._run(self.remove, key)
+
     def get(self, key: str, default: Any = None) -> Any:
         if self.config is None:
             raise ValueError("Config is not loaded")
@@ -38,8 +270,10 @@ class Config:
     def set(self, key: str, value: Any) -> Config:
         if self.config is None:
             raise ValueError("Config is not loaded")
-        self.config[key] = value
-        self.save()
+        with self._lock:
+            self.config[key] = value
+            self._mark_dirty()
+        self._persist()
         return self
 
     def remove(self, key: str) -> Config:
@@ -47,8 +281,10 @@ class Config:
             raise ValueError("Config is not loaded")
         if key not in self.config:
             raise KeyError(f"Key '{key}' not found")
-        del self.config[key]
-        self.save()
+        with self._lock:
+            del self.config[key]
+            self._mark_dirty()
+        self._persist()
         return self
 
     def exists(self, key: str) -> bool:
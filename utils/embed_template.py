@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import discord
+
+from . import local_file
+
+
+class EmbedTemplate:
+    """
+    The static parts (title, color and thumbnail) of an embed used for replies.
+
+    `render` builds a fresh `discord.Embed` with the per-call description and
+    fields. Embeds are constructed directly rather than copied, since
+    `discord.Embed.copy` and `from_dict` round-trip through a dict and cost more.
+
+    Parameters
+    ----------
+    title : str
+        The title of the embed.
+    color : discord.Color, optional
+        The color of the embed. Defaults to teal.
+    thumbnail : str | None, optional
+        The path of the asset used as the thumbnail, resolved through `local_file`.
+    """
+
+    def __init__(self, title: str, color: discord.Color | None = None, thumbnail: str | None = None):
+        self.title = title
+        self.color = color or discord.Color.teal()
+        self.thumbnail = thumbnail
+
+    def render(
+        self,
+        description: str | None = None,
+        fields: Iterable[tuple[str, str, bool]] = ()
+    ) -> tuple[discord.Embed, discord.File | None]:
+        """
+        Builds an embed from the template.
+
+        Parameters
+        ----------
+        description : str | None, optional
+            The description of the embed.
+        fields : Iterable[tuple[str, str, bool]], optional
+            The (name, value, inline) fields to add.
+
+        Returns
+        -------
+        tuple[discord.Embed, discord.File | None]
+            The embed, and the thumbnail file to send with it if it has to be uploaded.
+        """
+        embed = discord.Embed(title=self.title, color=self.color, description=description)
+        for name, value, inline in fields:
+            embed.add_field(name=name, value=value, inline=inline)
+
+        file = None
+        if self.thumbnail is not None:
+            url, file = local_file.resolve_asset(self.thumbnail)
+            embed.set_thumbnail(url=url)
+
+        return embed, file
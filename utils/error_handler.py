@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Coroutine, TypeVar
+
+
+ErrorHandler = Callable[..., Coroutine[Any, Any, Any]]
+F = TypeVar("F", bound=ErrorHandler)
+
+
+def error_handler(*error_types: type[BaseException]) -> Callable[[F], F]:
+    """
+    Marks a cog method as the handler for the given exception types.
+
+    `BaseCog` registers marked methods with the bot's `ErrorHandlerRegistry`
+    when the cog is created and removes them when it is unloaded.
+
+    Parameters
+    ----------
+    *error_types : type[BaseException]
+        The exception types handled by the method. Subclasses are handled too
+        unless they have a more specific handler.
+    """
+    def decorator(func: F) -> F:
+        func.__error_handler_types__ = error_types
+        return func
+
+    return decorator
+
+
+class ErrorHandlerRegistry:
+    """
+    Maps exception types to handlers.
+
+    Lookup walks the exception's MRO to find the most specific handler, and the
+    result is cached per type, so dispatch costs a dict lookup however many
+    handlers are registered.
+
+    Each type keeps a stack of (owner, handler). The latest registration wins,
+    and unregistering an owner restores the handler it overrode, so an
+    extension can override another's handler for as long as it is loaded.
+    """
+
+    def __init__(self):
+        self._handlers: dict[type[BaseException], list[tuple[Any, ErrorHandler]]] = {}
+        self._cache: dict[type[BaseException], ErrorHandler | None] = {}
+
+    def register(self, error_type: type[BaseException], handler: ErrorHandler, owner: Any = None):
+        stack = self._handlers.setdefault(error_type, [])
+        if owner is not None:
+            stack[:] = [entry for entry in stack if entry[0] is not owner]
+        stack.append((owner, handler))
+        self._cache.clear()
+
+    def unregister(self, error_type: type[BaseException], owner: Any = None):
+        """
+        Removes `owner`'s handler for `error_type`, leaving other owners' handlers in place.
+        """
+        stack = self._handlers.get(error_type)
+        if not stack:
+            return
+        stack[:] = [entry for entry in stack if entry[0] is not owner]
+        if not stack:
+            del self._handlers[error_type]
+        self._cache.clear()
+
+    def register_object(self, obj: Any) -> list[type[BaseException]]:
+        """
+        Registers every method of `obj` marked with `error_handler`, owned by `obj`.
+
+        Returns
+        -------
+        list[type[BaseException]]
+            The exception types handled by `obj`.
+        """
+        registered = []
+        for name in dir(type(obj)):
+            error_types = getattr(getattr(type(obj), name, None), "__error_handler_types__", None)
+            if not error_types:
+                continue
+            handler = getattr(obj, name)
+            for error_type in error_types:
+                self.register(error_type, handler, obj)
+                registered.append(error_type)
+        return registered
+
+    def unregister_object(self, obj: Any):
+        """
+        Removes every handler owned by `obj`.
+        """
+        for error_type in [t for t, stack in self._handlers.items() if any(entry[0] is obj for entry in stack)]:
+            self.unregister(error_type, obj)
+
+    def resolve(self, error_type: type[BaseException]) -> ErrorHandler | None:
+        try:
+            return self._cache[error_type]
+        except KeyError:
+            pass
+
+        handler = None
+        for base in error_type.__mro__:
+            stack = self._handlers.get(base)
+            if stack:
+                handler = stack[-1][1]
+                break
+
+        self._cache[error_type] = handler
+        return handler
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import ast
+import asyncio
+import logging
+import time
+import traceback
+from typing import Mapping, Sequence
+
+from discord.ext import commands
+
+
+logger = logging.getLogger("KurdDX.extension_loader")
+
+# Module-level name an extension assigns its dependencies to, e.g. DEPENDS = ("extensions.Exception",)
+DEPENDS_NAME = "DEPENDS"
+
+
+def read_dependencies(module: ast.Module) -> tuple[str, ...]:
+    """
+    Returns the literal `DEPENDS` declared in an extension's parsed source, without importing it.
+    """
+    for node in module.body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets = [node.target]
+        else:
+            continue
+
+        if any(isinstance(t, ast.Name) and t.id == DEPENDS_NAME for t in targets):
+            value = ast.literal_eval(node.value)
+            return (value,) if isinstance(value, str) else tuple(value)
+    return ()
+
+
+def _unresolvable(dependencies: Mapping[str, Sequence[str]]) -> set[str]:
+    """
+    Returns the extensions that are in, or depend on, a dependency cycle.
+    """
+    remaining = {name: {d for d in deps if d in dependencies} for name, deps in dependencies.items()}
+    ready = [name for name, deps in remaining.items() if not deps]
+    while ready:
+        name = ready.pop()
+        del remaining[name]
+        for other, deps in remaining.items():
+            if name in deps:
+                deps.discard(name)
+                if not deps:
+                    ready.append(other)
+    return set(remaining)
+
+
+async def load_extensions(
+    bot: commands.Bot,
+    dependencies: Mapping[str, Sequence[str]],
+    reload: bool = False
+) -> dict[str, float]:
+    """
+    Loads extensions concurrently, each one after the extensions it depends on.
+
+    Parameters
+    ----------
+    bot : commands.Bot
+        The bot to load the extensions into.
+    dependencies : Mapping[str, Sequence[str]]
+        The extensions to load, each with the extensions it depends on.
+        Dependencies that are already loaded and not listed are satisfied.
+    reload : bool, optional
+        Whether to reload listed extensions that are already loaded, instead of
+        skipping them. A dependency is still reloaded before its dependents.
+
+    Returns
+    -------
+    dict[str, float]
+        The load time of each extension that loaded, in seconds.
+    """
+    times: dict[str, float] = {}
+    cyclic = _unresolvable(dependencies)
+    tasks: dict[str, asyncio.Task[bool]] = {}
+
+    async def load(name: str) -> bool:
+        if name in cyclic:
+            logger.error(f"Failed to load extension {name}: dependency cycle")
+            return False
+
+        for dependency in dependencies[name]:
+            if dependency in tasks:
+                if not await tasks[dependency]:
+                    logger.error(f"Skipped extension {name}: dependency {dependency} failed to load")
+                    return False
+            elif dependency not in bot.extensions:
+                logger.error(f"Failed to load extension {name}: unknown dependency {dependency}")
+                return False
+
+        loaded = name in bot.extensions
+        if loaded and not reload:
+            return True
+
+        start = time.perf_counter()
+        try:
+            if loaded:
+                await bot.reload_extension(name)
+            else:
+                await bot.load_extension(name)
+        except Exception as e:
+            tb = traceback.format_exc()
+            logger.error(f"Failed to {'reload' if loaded else 'load'} extension {name}: {e}\n{tb}")
+            return False
+
+        times[name] = time.perf_counter() - start
+        logger.info(f"{'Reloaded' if loaded else 'Loaded'} extension {name} ({times[name] * 1000:.1f} ms)")
+        return True
+
+    for name in dependencies:
+        tasks[name] = asyncio.create_task(load(name))
+    await asyncio.gather(*tasks.values())
+
+    return times
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import ast
+import json
+import logging
+import os
+
+from utils.config import Config
+from utils.extension_loader import read_dependencies
+
+
+logger = logging.getLogger("KurdDX.extension_manifest")
+
+
+def _inspect(source: str, filename: str) -> tuple[bool, tuple[str, ...]]:
+    """
+    Returns whether the source defines a module-level `async def setup` and its declared dependencies.
+    """
+    try:
+        module = ast.parse(source, filename)
+    except SyntaxError:
+        # Let load_extension report the error instead of silently skipping the file
+        return True, ()
+
+    has_setup = any(isinstance(node, ast.AsyncFunctionDef) and node.name == "setup" for node in module.body)
+    try:
+        depends = read_dependencies(module)
+    except (ValueError, TypeError):
+        logger.warning("%s: DEPENDS must be a literal tuple of extension names", filename)
+        depends = ()
+    return has_setup, depends
+
+
+class ExtensionManifest:
+    """
+    Finds the extensions under `root`, re-reading only files that changed.
+
+    Each file is recorded with its mtime and size, whether it defines
+    `async def setup`, and its `DEPENDS`. A scan stats every file but parses
+    only new or changed ones. Packages are searched recursively; a package
+    whose `__init__.py` defines `setup` is one extension.
+
+    Parameters
+    ----------
+    root : str
+        The extensions directory, relative to the working directory.
+    path : str | None
+        The JSON file the manifest is kept in between runs. None keeps it in memory only.
+    """
+
+    def __init__(self, root: str, path: str | None = None):
+        self.root = root
+        self.store = Config(path, indent=None) if path is not None else None
+        self._entries: dict[str, dict] | None = None
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            self._entries = {}
+            if self.store is not None:
+                try:
+                    self._entries = self.store.load().config
+                except (FileNotFoundError, json.JSONDecodeError):
+                    self.store.config = self._entries
+        return self._entries
+
+    def scan(self) -> dict[str, tuple[str, ...]]:
+        """
+        Returns every extension's module name with its dependencies.
+        """
+        entries = self._load()
+        seen: set[str] = set()
+        extensions: dict[str, tuple[str, ...]] = {}
+        changed = self._scan_dir(self.root, entries, seen, extensions)
+
+        for path in [p for p in entries if p not in seen]:
+            del entries[path]
+            changed = True
+
+        if changed and self.store is not None:
+            self.store.config = entries
+            try:
+                self.store.save()
+            except OSError as e:
+                logger.warning("Failed to save extension manifest: %s", e)
+
+        return extensions
+
+    def _scan_dir(self, directory: str, entries: dict[str, dict], seen: set[str], extensions: dict[str, tuple[str, ...]]) -> bool:
+        changed = False
+        with os.scandir(directory) as it:
+            files = sorted(it, key=lambda e: e.name)
+
+        init = next((f for f in files if f.name == "__init__.py" and f.is_file()), None)
+        if init is not None and directory != self.root:
+            changed |= self._check(init, entries, seen)
+            entry = entries[init.path]
+            if entry["setup"]:
+                extensions[self._module_name(init.path)] = tuple(entry["depends"])
+                return changed
+
+        for file in files:
+            if file.name.startswith(("_", ".")):
+                continue
+            if file.is_dir():
+                changed |= self._scan_dir(file.path, entries, seen, extensions)
+            elif file.name.endswith(".py") and file.is_file():
+                changed |= self._check(file, entries, seen)
+                entry = entries[file.path]
+                if entry["setup"]:
+                    extensions[self._module_name(file.path)] = tuple(entry["depends"])
+        return changed
+
+    def _check(self, file: os.DirEntry, entries: dict[str, dict], seen: set[str]) -> bool:
+        seen.add(file.path)
+        st = file.stat()
+        entry = entries.get(file.path)
+        if entry is not None and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return False
+
+        with open(file.path, "r", encoding="utf-8") as f:
+            has_setup, depends = _inspect(f.read(), file.path)
+        entries[file.path] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "setup": has_setup,
+            "depends": list(depends),
+        }
+        return True
+
+    @staticmethod
+    def _module_name(path: str) -> str:
+        name, _ = os.path.splitext(os.path.normpath(path))
+        if os.path.basename(name) == "__init__":
+            name = os.path.dirname(name)
+        return name.replace(os.sep, os.extsep)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable
+
+import discord
+
+
+class GuildCounts:
+    __slots__ = ("shard_id", "members", "bots", "channels", "roles")
+
+    def __init__(self, guild: discord.Guild):
+        self.shard_id: int = guild.shard_id
+        self.members: int = guild.member_count or len(guild.members)
+        self.bots: int = sum(1 for m in guild.members if m.bot)
+        self.channels: int = len(guild.channels)
+        self.roles: int = len(guild.roles)
+
+    @property
+    def humans(self) -> int:
+        return self.members - self.bots
+
+
+class GuildStats:
+    """
+    Per-guild and global counts kept up to date from gateway events.
+
+    `rebuild` scans every guild once (on ready); afterwards each event adjusts
+    the counts, so reading them never iterates guilds or members. Bot counts
+    only cover members in the member cache.
+    """
+
+    def __init__(self):
+        self._guilds: dict[int, GuildCounts] = {}
+        self.shard_guilds: Counter[int] = Counter()
+        self.members = 0
+        self.bots = 0
+        self.channels = 0
+        self.roles = 0
+
+    @property
+    def guilds(self) -> int:
+        return len(self._guilds)
+
+    @property
+    def humans(self) -> int:
+        return self.members - self.bots
+
+    def get(self, guild_id: int) -> GuildCounts | None:
+        return self._guilds.get(guild_id)
+
+    def rebuild(self, guilds: Iterable[discord.Guild]):
+        self._guilds.clear()
+        self.shard_guilds.clear()
+        self.members = self.bots = self.channels = self.roles = 0
+        for guild in guilds:
+            self.add_guild(guild)
+
+    def add_guild(self, guild: discord.Guild):
+        self.remove_guild(guild)
+        counts = self._guilds[guild.id] = GuildCounts(guild)
+        self._apply(counts, 1)
+
+    def remove_guild(self, guild: discord.Guild):
+        counts = self._guilds.pop(guild.id, None)
+        if counts is not None:
+            self._apply(counts, -1)
+
+    def member_joined(self, member: discord.Member):
+        self._adjust_member(member, 1)
+
+    def member_left(self, member: discord.Member):
+        self._adjust_member(member, -1)
+
+    def channel_created(self, channel: discord.abc.GuildChannel):
+        self._adjust(channel.guild.id, "channels", 1)
+
+    def channel_deleted(self, channel: discord.abc.GuildChannel):
+        self._adjust(channel.guild.id, "channels", -1)
+
+    def role_created(self, role: discord.Role):
+        self._adjust(role.guild.id, "roles", 1)
+
+    def role_deleted(self, role: discord.Role):
+        self._adjust(role.guild.id, "roles", -1)
+
+    def _adjust_member(self, member: discord.Member, delta: int):
+        self._adjust(member.guild.id, "members", delta)
+        if member.bot:
+            self._adjust(member.guild.id, "bots", delta)
+
+    def _adjust(self, guild_id: int, field: str, delta: int):
+        counts = self._guilds.get(guild_id)
+        if counts is None:
+            return
+        setattr(counts, field, getattr(counts, field) + delta)
+        setattr(self, field, getattr(self, field) + delta)
+
+    def _apply(self, counts: GuildCounts, sign: int):
+        self.shard_guilds[counts.shard_id] += sign
+        if self.shard_guilds[counts.shard_id] <= 0:
+            del self.shard_guilds[counts.shard_id]
+        self.members += sign * counts.members
+        self.bots += sign * counts.bots
+        self.channels += sign * counts.channels
+        self.roles += sign * counts.roles
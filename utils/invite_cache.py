@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Iterable
+
+import discord
+
+
+logger = logging.getLogger("KurdDX.invite_cache")
+
+
+class InviteCache:
+    """
+    Caches each guild's invites for `ttl` seconds.
+
+    Fetches for many guilds run concurrently, up to `concurrency` at a time,
+    each bounded by `timeout`. Concurrent fetches for the same guild share one
+    request. Entries are dropped early by `invalidate`, called from the invite
+    create/delete events and when the bot leaves a guild.
+
+    Parameters
+    ----------
+    ttl : float
+        How long fetched invites are reused, in seconds.
+    timeout : float
+        The timeout for fetching one guild's invites, in seconds.
+    concurrency : int
+        The maximum number of guilds fetched at the same time.
+    """
+
+    def __init__(self, ttl: float = 300, timeout: float = 10, concurrency: int = 10):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self._entries: dict[int, tuple[float, list[discord.Invite]]] = {}
+        self._pending: dict[int, asyncio.Task[list[discord.Invite] | None]] = {}
+        self._invalidations: dict[int, int] = {}
+
+    @staticmethod
+    def can_fetch(guild: discord.Guild) -> bool:
+        return guild.me is not None and guild.me.guild_permissions.manage_guild
+
+    def invalidate(self, guild_id: int):
+        self._entries.pop(guild_id, None)
+        if guild_id in self._pending:
+            # Keep a fetch already in flight from caching what it read before the change
+            self._invalidations[guild_id] = self._invalidations.get(guild_id, 0) + 1
+
+    def clear(self):
+        self._entries.clear()
+
+    async def fetch(self, guild: discord.Guild) -> list[discord.Invite] | None:
+        """
+        Returns the guild's invites, or None if they could not be fetched in time.
+        """
+        entry = self._entries.get(guild.id)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        task = self._pending.get(guild.id)
+        if task is None:
+            # Snapshot now; the task may not start before an invalidation arrives
+            task = asyncio.create_task(self._fetch(guild, self._invalidations.get(guild.id, 0)))
+            self._pending[guild.id] = task
+            task.add_done_callback(lambda _: self._pending.pop(guild.id, None))
+        return await asyncio.shield(task)
+
+    async def fetch_many(self, guilds: Iterable[discord.Guild]) -> dict[int, list[discord.Invite] | None]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(guild: discord.Guild) -> list[discord.Invite] | None:
+            async with semaphore:
+                return await self.fetch(guild)
+
+        guilds = list(guilds)
+        results = await asyncio.gather(*(fetch(guild) for guild in guilds))
+        return {guild.id: invites for guild, invites in zip(guilds, results)}
+
+    async def _fetch(self, guild: discord.Guild, invalidations: int) -> list[discord.Invite] | None:
+        try:
+            invites = await asyncio.wait_for(guild.invites(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out fetching invites for guild %d", guild.id)
+            return None
+        except discord.HTTPException as e:
+            logger.warning("Failed to fetch invites for guild %d: %s", guild.id, e)
+            return None
+        else:
+            if self._invalidations.get(guild.id, 0) == invalidations:
+                self._entries[guild.id] = (time.monotonic() + self.ttl, invites)
+            return invites
+        finally:
+            self._invalidations.pop(guild.id, None)
+
+
+def top_invite(invites: list[discord.Invite]) -> discord.Invite | None:
+    """
+    Returns the most used invite, or None if there are none.
+    """
+    if not invites:
+        return None
+    return max(invites, key=lambda i: i.uses or -1)
@@ -1,6 +1,10 @@
 import os
 import io
-from typing import Optional, Tuple, Union
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlparse
 
 import discord
 
@@ -30,3 +34,233 @@ def attach(file: Union[str, bytes], file_name: Optional[str] = None) -> Tuple[st
     
     url = "attachment://" + file_name
     return url, file
+
+
+class _AssetFile(discord.File):
+    # Carries the asset it was created from, so the upload is matched to the send it belongs to
+    __slots__ = ("asset_key",)
+
+    def __init__(self, data: bytes, file_name: str, asset_key: str):
+        super().__init__(io.BytesIO(data), file_name)
+        self.asset_key = asset_key
+
+
+class _UploadedURL(NamedTuple):
+    url: str
+    expires_at: float
+    channel_id: Optional[int]
+    message_id: Optional[int]
+
+
+class AssetRegistry:
+    """In-memory cache of static assets, evicted least-recently-used under a byte budget.
+
+    Cached bytes are immutable and shared; every call to `attach` wraps them in a
+    fresh `discord.File`, so repeated sends never touch the filesystem.
+
+    When `reuse_urls` is enabled, the CDN URL of the first successful upload of an
+    asset is remembered and `resolve` hands it out instead of a new attachment
+    until it expires, or until the message it was uploaded with (or that message's
+    channel) is deleted, since the URL stops working then.
+
+    Args:
+        max_bytes (int, optional): The total size of cached assets before the least recently used are evicted.
+        url_ttl (float, optional): How long to reuse an uploaded URL that carries no expiry of its own, in seconds.
+        clock (Callable[[], float], optional): The wall clock used for URL expiry.
+    """
+
+    # Stop reusing a signed CDN URL this many seconds before Discord expires it.
+    URL_EXPIRY_MARGIN = 300
+
+    def __init__(
+        self,
+        max_bytes: int = 8 * 1024 * 1024,
+        url_ttl: float = 12 * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_bytes = max_bytes
+        self.url_ttl = url_ttl
+        self.reuse_urls = False
+        self._clock = clock
+        self._assets: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._urls: Dict[str, _UploadedURL] = {}
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normpath(path)
+
+    def preload(self, directory: str) -> int:
+        """Load every file in a directory into the cache.
+
+        Args:
+            directory (str): The directory to load.
+
+        Returns:
+            int: The number of files loaded.
+        """
+        count = 0
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                self.get(path)
+                count += 1
+        return count
+
+    def get(self, path: str) -> bytes:
+        """Return the content of an asset, reading it from disk only on a cache miss.
+
+        Args:
+            path (str): The path of the asset.
+
+        Returns:
+            bytes: The content of the asset.
+        """
+        key = self._key(path)
+        with self._lock:
+            data = self._assets.get(key)
+            if data is not None:
+                self._assets.move_to_end(key)
+                return data
+
+        with open(key, "rb") as f:
+            data = f.read()
+
+        with self._lock:
+            if key not in self._assets:
+                self._assets[key] = data
+                self._size += len(data)
+                while self._size > self.max_bytes and len(self._assets) > 1:
+                    _, evicted = self._assets.popitem(last=False)
+                    self._size -= len(evicted)
+        return data
+
+    def attach(self, path: str, file_name: Optional[str] = None) -> Tuple[str, discord.File]:
+        """Attach a cached asset to a discord message
+
+        Args:
+            path (str): The path of the asset.
+            file_name (Optional[str], optional): The name of the file. Defaults to the base name of the path.
+
+        Returns:
+            tuple: A tuple containing the URL of the attachment and the discord.File object.
+        """
+        file_name = file_name or os.path.basename(path)
+        return "attachment://" + file_name, _AssetFile(self.get(path), file_name, self._key(path))
+
+    def resolve(self, path: str, file_name: Optional[str] = None) -> Tuple[str, Optional[discord.File]]:
+        """Return a URL for an asset, and the file to upload if there is no reusable CDN URL
+
+        Args:
+            path (str): The path of the asset.
+            file_name (Optional[str], optional): The name of the file. Defaults to the base name of the path.
+
+        Returns:
+            tuple: A tuple containing the URL and the discord.File object, or None if the URL is already uploaded.
+        """
+        key = self._key(path)
+        if self.reuse_urls:
+            cached = self._urls.get(key)
+            if cached is not None:
+                if self._clock() < cached.expires_at:
+                    return cached.url, None
+                del self._urls[key]
+
+        return self.attach(path, file_name)
+
+    def remember(self, path: str, url: str, channel_id: Optional[int] = None, message_id: Optional[int] = None):
+        """Record the CDN URL an asset was uploaded to
+
+        The expiry is read from the `ex` query parameter of signed Discord CDN URLs,
+        falling back to `url_ttl`.
+
+        Args:
+            path (str): The path of the asset.
+            url (str): The CDN URL of the uploaded asset.
+            channel_id (Optional[int], optional): The channel of the message the asset was uploaded with.
+            message_id (Optional[int], optional): The message the asset was uploaded with.
+        """
+        now = self._clock()
+        expires_at = now + self.url_ttl
+        ex = parse_qs(urlparse(url).query).get("ex")
+        if ex:
+            try:
+                expires_at = min(expires_at, int(ex[0], 16) - self.URL_EXPIRY_MARGIN)
+            except ValueError:
+                pass
+        if expires_at > now:
+            self._urls[self._key(path)] = _UploadedURL(url, expires_at, channel_id, message_id)
+
+    @staticmethod
+    def _uploaded_urls(message: discord.Message) -> Iterator[str]:
+        # Files referenced as attachment:// in an embed are resolved to their CDN URL there
+        for embed in message.embeds:
+            for url in (embed.thumbnail.url, embed.image.url):
+                if url:
+                    yield url
+        for attachment in message.attachments:
+            yield attachment.url
+
+    def record_upload(self, message: Optional[discord.Message], file: Optional[discord.File]):
+        """Remember the CDN URL of an asset uploaded with a message
+
+        Nothing is recorded until the send succeeds, so a send that fails or is
+        dropped leaves no state behind.
+
+        Args:
+            message (Optional[discord.Message]): The message that was sent.
+            file (Optional[discord.File]): The file sent with it, as returned by `resolve`.
+        """
+        if not self.reuse_urls or message is None or not isinstance(file, _AssetFile):
+            return
+        for url in self._uploaded_urls(message):
+            if os.path.basename(urlparse(url).path) == file.filename:
+                self.remember(file.asset_key, url, message.channel.id, message.id)
+                return
+
+    def forget_message(self, message_id: int):
+        """Stop reusing URLs uploaded with a deleted message
+
+        Args:
+            message_id (int): The ID of the deleted message.
+        """
+        for key in [k for k, u in self._urls.items() if u.message_id == message_id]:
+            del self._urls[key]
+
+    def forget_channel(self, channel_id: int):
+        """Stop reusing URLs uploaded to a deleted channel
+
+        Args:
+            channel_id (int): The ID of the deleted channel.
+        """
+        for key in [k for k, u in self._urls.items() if u.channel_id == channel_id]:
+            del self._urls[key]
+
+assets = AssetRegistry()
+
+
+def attach_asset(path: str, file_name: Optional[str] = None) -> Tuple[str, discord.File]:
+    """Attach a file from the shared asset cache to a discord message
+
+    Args:
+        path (str): The path of the asset.
+        file_name (Optional[str], optional): The name of the file. Defaults to the base name of the path.
+
+    Returns:
+        tuple: A tuple containing the URL of the attachment and the discord.File object.
+    """
+    return assets.attach(path, file_name)
+
+
+def resolve_asset(path: str, file_name: Optional[str] = None) -> Tuple[str, Optional[discord.File]]:
+    """Resolve an asset from the shared cache to a reusable URL or a fresh attachment
+
+    Args:
+        path (str): The path of the asset.
+        file_name (Optional[str], optional): The name of the file. Defaults to the base name of the path.
+
+    Returns:
+        tuple: A tuple containing the URL and the discord.File object, or None if the URL is already uploaded.
+    """
+    return assets.resolve(path, file_name)
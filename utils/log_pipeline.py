@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import copy
+import logging
+import queue
+import threading
+from collections import Counter
+
+
+OVERFLOW_POLICIES = ("block", "drop", "drop_debug_first")
+
+
+class _PipelineHandler(logging.Handler):
+    def __init__(self, pipeline: LogPipeline, targets: list[logging.Handler]):
+        super().__init__()
+        self.pipeline = pipeline
+        self.targets = targets
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.pipeline.enqueue(self.targets, record)
+        except Exception:
+            self.handleError(record)
+
+
+class LogPipeline:
+    """
+    Moves logging handler work onto a listener thread.
+
+    `install` replaces the handlers of the given loggers with a handler that only
+    enqueues the record; the listener thread then formats and writes it with the
+    original handlers. Handlers with a truthy `synchronous` attribute (such as
+    the console capture handler, which depends on the caller's context) are left
+    in place.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of queued records.
+    overflow : str
+        What to do when the queue is full: "block" waits for space, "drop" drops
+        the record, and "drop_debug_first" drops DEBUG records once the queue is
+        three quarters full, keeping the rest of the queue for higher levels.
+        Only "block" ever makes the logging thread (usually the event loop) wait.
+    """
+
+    def __init__(self, capacity: int = 10000, overflow: str = "drop_debug_first"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}")
+
+        self.capacity = capacity
+        self.overflow = overflow
+        self.dropped: Counter[str] = Counter()
+
+        self._queue: queue.Queue[tuple[list[logging.Handler], logging.LogRecord] | None] = queue.Queue(capacity)
+        self._high_water = capacity * 3 // 4
+        self._installed: dict[str, list[logging.Handler]] = {}
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def install(self, *logger_names: str):
+        for name in logger_names:
+            if name in self._installed:
+                continue
+            logger = logging.getLogger(name or None)
+            original = list(logger.handlers)
+            targets = [h for h in original if not getattr(h, "synchronous", False)]
+            if not targets:
+                continue
+            for handler in targets:
+                logger.removeHandler(handler)
+            logger.addHandler(_PipelineHandler(self, targets))
+            self._installed[name] = original
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="KurdDX.log_pipeline", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Restores the original handlers and writes out every queued record.
+        """
+        for name, original in self._installed.items():
+            logger = logging.getLogger(name or None)
+            for handler in list(logger.handlers):
+                if isinstance(handler, _PipelineHandler) and handler.pipeline is self:
+                    logger.removeHandler(handler)
+            for handler in original:
+                if handler not in logger.handlers:
+                    logger.addHandler(handler)
+        self._installed.clear()
+
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def enqueue(self, targets: list[logging.Handler], record: logging.LogRecord):
+        record = self._prepare(record)
+        item = (targets, record)
+
+        if self.overflow == "block":
+            self._queue.put(item)
+            return
+
+        if self.overflow == "drop_debug_first" and record.levelno <= logging.DEBUG:
+            if self._queue.qsize() >= self._high_water:
+                self.dropped[record.levelname] += 1
+                return
+
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped[record.levelname] += 1
+
+    @staticmethod
+    def _prepare(record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve everything that depends on the caller before crossing threads
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            targets, record = item
+            for handler in targets:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
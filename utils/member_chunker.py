@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Callable
+
+import discord
+
+
+logger = logging.getLogger("KurdDX.member_chunker")
+
+
+class MemberChunker:
+    """
+    Requests a guild's full member list only when a feature needs it.
+
+    Concurrent requests for the same guild share one gateway request. When
+    `evict` is enabled, the members of guilds that have not been used for
+    `idle_timeout` seconds are dropped from the cache again by `evict_idle`.
+
+    Parameters
+    ----------
+    idle_timeout : float
+        How long a chunked guild stays cached after its last use, in seconds.
+    evict : bool
+        Whether idle guilds are evicted. Leave this off when the cache profile
+        keeps every member anyway.
+    timeout : float
+        The minimum time to wait for a chunk request. It grows with the guild's size.
+    """
+
+    def __init__(self, idle_timeout: float = 600, evict: bool = False, timeout: float = 30):
+        self.idle_timeout = idle_timeout
+        self.evict = evict
+        self.timeout = timeout
+        self._last_used: dict[int, float] = {}
+        self._pending: dict[int, asyncio.Task[bool]] = {}
+
+    def is_cached(self, guild_id: int) -> bool:
+        return guild_id in self._last_used
+
+    async def ensure(self, guild: discord.Guild) -> bool:
+        """
+        Makes sure the guild's members are cached.
+
+        Returns
+        -------
+        bool
+            Whether the full member list is available.
+        """
+        self._last_used[guild.id] = time.monotonic()
+        if guild.chunked:
+            return True
+
+        task = self._pending.get(guild.id)
+        if task is None:
+            task = asyncio.create_task(self._chunk(guild))
+            self._pending[guild.id] = task
+            task.add_done_callback(lambda _: self._pending.pop(guild.id, None))
+        return await asyncio.shield(task)
+
+    def evict_idle(self, get_guild: Callable[[int], discord.Guild | None]) -> list[int]:
+        """
+        Drops the cached members of idle guilds, except the bot itself.
+
+        Returns
+        -------
+        list[int]
+            The IDs of the evicted guilds.
+        """
+        if not self.evict:
+            return []
+
+        deadline = time.monotonic() - self.idle_timeout
+        evicted = []
+        for guild_id, last_used in list(self._last_used.items()):
+            if last_used > deadline or guild_id in self._pending:
+                continue
+
+            del self._last_used[guild_id]
+            guild = get_guild(guild_id)
+            if guild is None:
+                continue
+
+            me = guild.me
+            for member in list(guild.members):
+                if me is None or member.id != me.id:
+                    guild._remove_member(member)
+            evicted.append(guild_id)
+
+        if evicted:
+            logger.info("Evicted member caches of %d idle guilds", len(evicted))
+        return evicted
+
+    async def _chunk(self, guild: discord.Guild) -> bool:
+        timeout = max(self.timeout, (guild.member_count or 0) / 10000)
+        try:
+            await asyncio.wait_for(guild.chunk(cache=True), timeout=timeout)
+        except discord.ClientException as e:
+            logger.warning("Cannot chunk guild %d: %s", guild.id, e)
+            self._last_used.pop(guild.id, None)
+            return False
+        except asyncio.TimeoutError:
+            logger.warning("Timed out chunking guild %d", guild.id)
+            self._last_used.pop(guild.id, None)
+            return False
+        return True
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import bisect
+from typing import Iterator
+
+import discord
+
+
+MemberKey = tuple[bool, str, int]
+
+
+def member_key(member: discord.abc.User) -> MemberKey:
+    return (member.bot, member.name, member.id)
+
+
+class MemberIndex:
+    """
+    Keeps a sorted view of guild members, ordered by (bot, name, id).
+
+    A guild's view is built the first time it is requested and then kept up to
+    date from member events, so paging through it never copies or re-sorts the
+    member list.
+    """
+
+    def __init__(self):
+        self._views: dict[int, list[MemberKey]] = {}
+
+    def view(self, guild: discord.Guild) -> list[MemberKey]:
+        keys = self._views.get(guild.id)
+        if keys is None or len(keys) != len(guild.members):
+            keys = self._views[guild.id] = sorted(member_key(m) for m in guild.members)
+        return keys
+
+    def page(self, guild: discord.Guild, page: int = 1, limit: int = 0) -> Iterator[discord.Member]:
+        """
+        Yields one page of members in stable order. A `limit` of 0 yields every member.
+        """
+        keys = self.view(guild)
+        start, stop = 0, len(keys)
+        if limit > 0:
+            start = (max(page, 1) - 1) * limit
+            stop = min(start + limit, stop)
+
+        for i in range(start, stop):
+            member = guild.get_member(keys[i][2])
+            if member is not None:
+                yield member
+
+    def add(self, member: discord.Member):
+        keys = self._views.get(member.guild.id)
+        if keys is not None:
+            bisect.insort(keys, member_key(member))
+
+    def remove(self, member: discord.Member):
+        keys = self._views.get(member.guild.id)
+        if keys is not None:
+            self._discard(keys, member_key(member))
+
+    def rename(self, before: discord.User, after: discord.User):
+        old, new = member_key(before), member_key(after)
+        if old == new:
+            return
+        for guild in after.mutual_guilds:
+            keys = self._views.get(guild.id)
+            if keys is not None and self._discard(keys, old):
+                bisect.insort(keys, new)
+
+    def drop(self, guild_id: int):
+        self._views.pop(guild_id, None)
+
+    @staticmethod
+    def _discard(keys: list[MemberKey], key: MemberKey) -> bool:
+        i = bisect.bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            del keys[i]
+            return True
+        return False
@@ -1,15 +1,37 @@
-import subprocess
-
+import discord
 from discord.ext import commands
 
 from . import exceptions
 from .config import Config
+from .capabilities import capabilities
 from constants import *
 
 
+def _developer_grants(config: Config) -> tuple[frozenset[int], frozenset[int]]:
+    return (
+        frozenset(config.get("developers", [])),
+        frozenset(config.get("developer_roles", [])),
+    )
+
+
+def is_developer(user: discord.abc.User, config: Config) -> bool:
+    """
+    Returns whether `user` is listed in `developers` or holds one of `developer_roles`.
+
+    The ID sets are rebuilt only when the config revision changes.
+    """
+    user_ids, role_ids = config.cached("developer_grants", _developer_grants)
+    if user.id in user_ids:
+        return True
+    if role_ids:
+        return any(role.id in role_ids for role in getattr(user, "roles", ()))
+    return False
+
+
 def dev_only():
     async def predicate(ctx: commands.Context) -> bool:
-        if not ctx.author.id in Config(CONFIG_FILE).load().get("developers", []):
+        config = await Config.shared(CONFIG_FILE).arefresh()
+        if not is_developer(ctx.author, config):
             raise commands.CheckFailure("You are not a developer.")
         return True
 
@@ -27,11 +49,9 @@ def slash_command_only():
 
 def ffmpeg_required():
     async def predicate(ctx: commands.Context) -> bool:
-        try:
-            result = subprocess.run(['ffmpeg', '-version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            return result.returncode == 0
-        except FileNotFoundError:
-            pass
+        capability = await capabilities.ensure("ffmpeg")
+        if capability.available:
+            return True
         
         raise exceptions.KurdDXError(exceptions.ExecutableNotFoundError("ffmpeg is not installed."))
 
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Hashable, Iterable
+
+import discord
+
+
+logger = logging.getLogger("KurdDX.presence")
+
+Render = Callable[[int | None], tuple[discord.BaseActivity | None, discord.Status]]
+Send = Callable[[discord.BaseActivity | None, discord.Status, int | None], Awaitable[None]]
+
+
+def _key(activity: discord.BaseActivity | None, status: discord.Status) -> Hashable:
+    return (None if activity is None else (type(activity), activity.name), status)
+
+
+class PresenceUpdater:
+    """
+    Pushes the bot's presence only when the rendered activity or status changed.
+
+    `render` computes a shard's presence from in-memory state; `send` performs
+    the gateway update. Pushes to a shard are spaced at least `min_interval`
+    seconds apart, and `schedule` debounces bursts of changes (e.g. many guild
+    joins) into one push per shard.
+
+    Parameters
+    ----------
+    render : Render
+        Returns (activity, status) for a shard ID, or None when not sharded.
+    send : Send
+        Sends (activity, status) to a shard.
+    debounce : float, optional
+        How long `schedule` waits before pushing, in seconds.
+    min_interval : float, optional
+        The minimum time between two pushes to the same shard, in seconds.
+        Discord allows about 5 presence updates per minute per connection.
+    clock : Callable[[], float], optional
+        The monotonic clock used for spacing pushes.
+    """
+
+    def __init__(
+        self,
+        render: Render,
+        send: Send,
+        debounce: float = 5,
+        min_interval: float = 12,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.render = render
+        self.send = send
+        self.debounce = debounce
+        self.min_interval = min_interval
+        self._clock = clock
+        self._last: dict[int | None, Hashable] = {}
+        self._next_allowed: dict[int | None, float] = {}
+        self._locks: dict[int | None, asyncio.Lock] = {}
+        self._scheduled: asyncio.Task[None] | None = None
+
+        self.pushed = 0
+        self.skipped = 0
+
+    def forget(self, shard_id: int | None):
+        """
+        Forgets what was last sent to a shard, so the next push always goes out
+        (e.g. after the shard reconnected and lost its presence).
+        """
+        self._last.pop(shard_id, None)
+
+    async def push(self, shard_id: int | None) -> bool:
+        """
+        Sends the shard's presence if it changed.
+
+        Returns
+        -------
+        bool
+            Whether an update was sent.
+        """
+        async with self._locks.setdefault(shard_id, asyncio.Lock()):
+            wait = self._next_allowed.get(shard_id, 0) - self._clock()
+            if wait > 0 and _key(*self.render(shard_id)) != self._last.get(shard_id):
+                await asyncio.sleep(wait)
+
+            activity, status = self.render(shard_id)
+            key = _key(activity, status)
+            if key == self._last.get(shard_id):
+                self.skipped += 1
+                return False
+
+            await self.send(activity, status, shard_id)
+            self._last[shard_id] = key
+            self._next_allowed[shard_id] = self._clock() + self.min_interval
+            self.pushed += 1
+            return True
+
+    async def push_all(self, shard_ids: Iterable[int | None]):
+        await asyncio.gather(*(self.push(shard_id) for shard_id in shard_ids))
+
+    def schedule(self, shard_ids: Callable[[], Iterable[int | None]], delay: float | None = None):
+        """
+        Pushes every shard after `delay` (the debounce by default). Changes made
+        while a push is already scheduled are picked up by that push.
+        """
+        if self._scheduled is not None and not self._scheduled.done():
+            if delay != 0:
+                return
+            self._scheduled.cancel()
+
+        self._scheduled = asyncio.create_task(self._push_later(shard_ids, self.debounce if delay is None else delay))
+
+    def cancel(self):
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+
+    async def _push_later(self, shard_ids: Callable[[], Iterable[int | None]], delay: float):
+        await asyncio.sleep(delay)
+        try:
+            await self.push_all(shard_ids())
+        except discord.DiscordException as e:
+            logger.warning("Failed to update presence: %s", e)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Awaitable, Callable, Hashable
+
+import discord
+
+
+logger = logging.getLogger("KurdDX.reply_coalescer")
+
+
+class _Entry:
+    def __init__(self, message: discord.Message | None, expires_at: float, description: str | None):
+        self.message = message
+        self.expires_at = expires_at
+        self.description = description
+        self.repeats = 0
+        self.summary: asyncio.Task[None] | None = None
+
+
+class ReplyCoalescer:
+    """
+    Collapses identical replies sent to the same user in the same channel.
+
+    The first reply inside `window` seconds is sent normally. Repeats of it are
+    suppressed and, once the window closes, the original reply is edited once
+    to show the latest description and a footer counting them. Independently, a channel gets at most
+    `channel_burst` replies per window; the rest are dropped. Both keep error
+    storms from spending the REST rate limit budget.
+
+    Parameters
+    ----------
+    window : float, optional
+        The coalescing window in seconds. 0 disables coalescing.
+    channel_burst : int, optional
+        The maximum number of replies per channel per window.
+    clock : Callable[[], float], optional
+        The monotonic clock used for windows.
+    """
+
+    def __init__(self, window: float = 5, channel_burst: int = 5, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.channel_burst = channel_burst
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._channels: dict[int, deque[float]] = {}
+
+        self.sent = 0
+        self.suppressed = 0
+        self.dropped = 0
+        self.edits = 0
+        self.suppressed_by_title: Counter[str] = Counter()
+
+    async def send(
+        self,
+        channel_id: int,
+        user_id: int,
+        embed: discord.Embed,
+        send: Callable[[], Awaitable[discord.Message | None]],
+        kind: Hashable = None,
+        detail: Hashable = None
+    ) -> discord.Message | None:
+        """
+        Calls `send` unless an identical reply went out recently.
+
+        Replies are identical when they go to the same user and channel with the
+        same `kind` (e.g. the command name), embed title and description. Pass
+        `detail` to compare that instead of the description, for replies whose
+        description changes between repeats (e.g. the remaining cooldown).
+
+        Returns
+        -------
+        discord.Message | None
+            The new message, the earlier message it was collapsed into, or None
+            if the reply was dropped.
+        """
+        if self.window <= 0:
+            self.sent += 1
+            return await send()
+
+        now = self._clock()
+        self._prune(now)
+
+        key = (channel_id, user_id, kind, embed.title, embed.description if detail is None else detail)
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.repeats += 1
+            entry.description = embed.description
+            self.suppressed += 1
+            self.suppressed_by_title[embed.title or ""] += 1
+            if entry.summary is None and entry.message is not None:
+                entry.summary = asyncio.create_task(self._summarize(entry))
+            return entry.message
+
+        sent_at = self._channels.setdefault(channel_id, deque())
+        while sent_at and sent_at[0] <= now - self.window:
+            sent_at.popleft()
+        if len(sent_at) >= self.channel_burst:
+            self.dropped += 1
+            self.suppressed_by_title[embed.title or ""] += 1
+            return None
+        sent_at.append(now)
+
+        entry = self._entries[key] = _Entry(None, now + self.window, embed.description)
+        try:
+            entry.message = await send()
+        except BaseException:
+            self._entries.pop(key, None)
+            raise
+        self.sent += 1
+        if entry.repeats and entry.message is not None:
+            entry.summary = asyncio.create_task(self._summarize(entry))
+        return entry.message
+
+    def reset(self):
+        self.sent = self.suppressed = self.dropped = self.edits = 0
+        self.suppressed_by_title.clear()
+
+    def _prune(self, now: float):
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.expires_at > now:
+                break
+            del self._entries[key]
+
+        for channel_id in [c for c, sent_at in self._channels.items() if not sent_at or sent_at[-1] <= now - self.window]:
+            del self._channels[channel_id]
+
+    async def _summarize(self, entry: _Entry):
+        await asyncio.sleep(max(0, entry.expires_at - self._clock()))
+
+        message = entry.message
+        if message is None or not message.embeds:
+            return
+
+        embed = message.embeds[0].copy()
+        embed.description = entry.description
+        embed.set_footer(text=f"Repeated {entry.repeats + 1} times")
+        try:
+            await message.edit(embed=embed)
+        except discord.HTTPException as e:
+            logger.warning("Failed to edit coalesced reply: %s", e)
+        else:
+            self.edits += 1
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+
+import discord
+from discord import app_commands
+
+from utils.config import Config
+
+
+logger = logging.getLogger("KurdDX.tree_sync")
+
+
+def tree_hash(tree: app_commands.CommandTree, guild: discord.abc.Snowflake | None = None) -> str:
+    """
+    Returns a hash of the payload `tree.sync(guild=guild)` would send.
+    """
+    payload = sorted(
+        (command.to_dict() for command in tree.get_commands(guild=guild)),
+        key=lambda c: (c.get("type", 1), c["name"]),
+    )
+    content = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class TreeSyncer:
+    """
+    Syncs the command tree only for scopes whose commands changed since the last sync.
+
+    The hash of each scope (global, and every guild with guild-only commands) is
+    stored in `path` under the application ID, so unchanged trees are not sent
+    again after a reconnect or restart.
+
+    Parameters
+    ----------
+    path : str
+        The JSON file the hashes are kept in.
+    """
+
+    def __init__(self, path: str):
+        # Re-read on every sync; cluster workers share the file
+        self.store = Config(path, indent=None, check_interval=0)
+
+    def _hashes(self) -> dict[str, str]:
+        try:
+            self.store.refresh()
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        if self.store.config is None:
+            self.store.config = {}
+        return self.store.config
+
+    async def sync(self, bot: discord.Client, force: bool = False) -> list[str]:
+        """
+        Syncs every changed scope, or every scope if `force` is set.
+
+        Returns
+        -------
+        list[str]
+            The synced scopes: "global" or the guild ID.
+        """
+        tree: app_commands.CommandTree = bot.tree
+        hashes = self._hashes()
+        prefix = f"{bot.application_id}:"
+
+        # discord.py has no public way to list the guilds with guild-only commands
+        guild_ids = {guild_id for guild_id, commands in tree._guild_commands.items() if commands}
+        guild_ids.update(int(key[len(prefix):]) for key in hashes if key.startswith(prefix) and key != f"{prefix}global")
+
+        scopes: list[tuple[str, discord.Object | None]] = [("global", None)]
+        scopes += [(str(guild_id), discord.Object(id=guild_id)) for guild_id in sorted(guild_ids)]
+
+        synced = []
+        for scope, guild in scopes:
+            key = prefix + scope
+            digest = tree_hash(tree, guild)
+            if not force and hashes.get(key) == digest:
+                continue
+
+            await tree.sync(guild=guild)
+            synced.append(scope)
+
+            if guild is not None and not tree.get_commands(guild=guild):
+                hashes.pop(key, None)
+            else:
+                hashes[key] = digest
+
+        if synced:
+            await self.store.asave()
+            logger.info("Synced command tree: %s", ", ".join(synced))
+        else:
+            logger.info("Command tree unchanged; skipped sync")
+
+        return synced